@@ -10,13 +10,54 @@ Commands:
 """
 
 import argparse
+import functools
 import sys
 import os
 
 
+# Default config written by `phylax init`. The schema is fixed, so it is
+# emitted from a template rather than paying for PyYAML's emitter.
+_DEFAULT_CONFIG_TEMPLATE = """\
+server:
+  host: 127.0.0.1
+  port: 8000
+storage:
+  base_dir: {base_dir}
+  format: json
+  sqlite_index: true
+tracing:
+  auto_capture: true
+"""
+
+
+# Banner rules used by bless/check/graph-check output
+_BAR = "═" * 60
+_BAR_SHORT = "═" * 50
+
+
+def _ellipsize(text: str, limit: int) -> str:
+    """Truncate text for display, marking the cut with '...'."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def _write_lines(lines: list[str]) -> None:
+    """
+    Write a block of output lines with a single write call.
+    
+    A closed pipe (e.g. `phylax list | head`) is not an error; stdout is
+    pointed at devnull so the interpreter's exit-time flush stays quiet.
+    """
+    try:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
 def cmd_init(args):
     """Initialize Phylax configuration."""
-    import yaml
+    import json
     from pathlib import Path
     
     config_dir = Path(os.path.expanduser("~/.phylax"))
@@ -29,23 +70,10 @@ def cmd_init(args):
         print("Use --force to overwrite")
         return 1
     
-    default_config = {
-        "storage": {
-            "base_dir": str(config_dir),
-            "format": "json",
-            "sqlite_index": True,
-        },
-        "server": {
-            "host": "127.0.0.1",
-            "port": 8000,
-        },
-        "tracing": {
-            "auto_capture": True,
-        },
-    }
-    
+    # A JSON string is a valid YAML double-quoted scalar, so this stays
+    # correct for paths containing backslashes, '#' or ': '
     with open(config_file, "w") as f:
-        yaml.dump(default_config, f, default_flow_style=False)
+        f.write(_DEFAULT_CONFIG_TEMPLATE.format(base_dir=json.dumps(str(config_dir))))
     
     print(f"Initialized Phylax at {config_dir}")
     print(f"Config: {config_file}")
@@ -70,6 +98,11 @@ def cmd_server(args):
     return 0
 
 
+# One `phylax list` row. The precision in each spec truncates the field, so
+# slicing and padding happen in a single format call.
+_LIST_ROW = "{:<8} {:<36.35} {:<16.15} {}ms".format
+
+
 def cmd_list(args):
     """List traces."""
     from server.storage.files import FileStorage
@@ -79,12 +112,9 @@ def cmd_list(args):
         limit=args.limit,
         model=args.model,
         provider=args.provider,
+        verdict_status="fail" if args.failed else None,
     )
     
-    # Filter by verdict if requested
-    if args.failed:
-        traces = [t for t in traces if t.verdict and t.verdict.status == "fail"]
-    
     if not traces:
         if args.failed:
             print("No failed traces found. ✅")
@@ -92,8 +122,10 @@ def cmd_list(args):
             print("No traces found.")
         return 0
     
-    print(f"{'STATUS':<8} {'ID':<36} {'Model':<16} {'Latency':<10}")
-    print("-" * 75)
+    lines = [
+        f"{'STATUS':<8} {'ID':<36} {'Model':<16} {'Latency':<10}",
+        "-" * 75,
+    ]
     
     for trace in traces:
         # Format verdict status
@@ -104,24 +136,21 @@ def cmd_list(args):
         else:
             status = "❌"
         
-        print(
-            f"{status:<8} "
-            f"{trace.trace_id[:35]:<36} "
-            f"{trace.request.model[:15]:<16} "
-            f"{trace.response.latency_ms}ms"
-        )
+        lines.append(_LIST_ROW(
+            status, trace.trace_id, trace.request.model, trace.response.latency_ms
+        ))
         
         # Show violations prominently for failed traces
         if trace.verdict and trace.verdict.status == "fail":
             for v in trace.verdict.violations:
-                print(f"         └─ {v}")
+                lines.append(f"         └─ {v}")
     
+    _write_lines(lines)
     return 0
 
 
 def cmd_show(args):
     """Show a specific trace."""
-    import json
     from server.storage.files import FileStorage
     
     storage = FileStorage()
@@ -132,48 +161,71 @@ def cmd_show(args):
         return 1
     
     if args.json:
-        print(json.dumps(trace.model_dump(), indent=2))
+        import json
+        json.dump(trace.model_dump(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
+        lines = []
+        
         # Show verdict status prominently at the top
         if trace.verdict:
             if trace.verdict.status == "pass":
-                print("═" * 60)
-                print("✅ VERDICT: PASS")
-                print("═" * 60)
+                lines += [_BAR, "✅ VERDICT: PASS", _BAR]
             else:
-                print("═" * 60)
-                print(f"❌ VERDICT: FAIL (Severity: {trace.verdict.severity})")
-                print("═" * 60)
-                print()
-                print("VIOLATIONS:")
-                for v in trace.verdict.violations:
-                    print(f"  • {v}")
-                print()
+                lines += [
+                    _BAR,
+                    f"❌ VERDICT: FAIL (Severity: {trace.verdict.severity})",
+                    _BAR,
+                    "",
+                    "VIOLATIONS:",
+                ]
+                lines += [f"  • {v}" for v in trace.verdict.violations]
+                lines.append("")
         
-        print(f"Trace ID: {trace.trace_id}")
-        print(f"Timestamp: {trace.timestamp}")
-        print(f"Model: {trace.request.model}")
-        print(f"Provider: {trace.request.provider}")
-        print(f"Latency: {trace.response.latency_ms}ms")
-        print(f"Blessed: {'Yes' if trace.blessed else 'No'}")
-        print()
-        print("Messages:")
-        for msg in trace.request.messages:
-            content = msg.content[:100] + "..." if len(msg.content) > 100 else msg.content
-            print(f"  [{msg.role}]: {content}")
-        print()
-        print("Response:")
-        response_text = trace.response.text[:500] + "..." if len(trace.response.text) > 500 else trace.response.text
-        print(f"  {response_text}")
+        lines += [
+            f"Trace ID: {trace.trace_id}",
+            f"Timestamp: {trace.timestamp}",
+            f"Model: {trace.request.model}",
+            f"Provider: {trace.request.provider}",
+            f"Latency: {trace.response.latency_ms}ms",
+            f"Blessed: {'Yes' if trace.blessed else 'No'}",
+            "",
+            "Messages:",
+        ]
+        lines += [
+            f"  [{msg.role}]: {_ellipsize(msg.content, 100)}"
+            for msg in trace.request.messages
+        ]
+        lines += ["", "Response:", f"  {_ellipsize(trace.response.text, 500)}"]
+        _write_lines(lines)
     
     return 0
 
 
+def _replay_args(trace) -> tuple[list[dict], dict]:
+    """
+    Build adapter messages and parameters from a stored trace.
+    
+    Reads the fields directly rather than going through model_dump(), and
+    leaves out unset values (including a message's optional name).
+    """
+    messages = []
+    for msg in trace.request.messages:
+        message = {"role": msg.role, "content": msg.content}
+        if msg.name is not None:
+            message["name"] = msg.name
+        messages.append(message)
+    params = {
+        key: value
+        for key, value in vars(trace.request.parameters).items()
+        if value is not None
+    }
+    return messages, params
+
+
 def cmd_replay(args):
     """Replay a trace."""
-    import json
     from server.storage.files import FileStorage
-    from sdk.adapters.openai import OpenAIAdapter
     
     storage = FileStorage()
     original = storage.get_trace(args.trace_id)
@@ -189,9 +241,10 @@ def cmd_replay(args):
         print("DRY RUN - no actual call will be made")
         return 0
     
+    from sdk.adapters.openai import OpenAIAdapter
+    
     adapter = OpenAIAdapter()
-    messages = [msg.model_dump() for msg in original.request.messages]
-    params = original.request.parameters.model_dump(exclude_none=True)
+    messages, params = _replay_args(original)
     
     if args.model:
         model = args.model
@@ -208,7 +261,7 @@ def cmd_replay(args):
     storage.save_trace(new_trace)
     
     print(f"New trace ID: {new_trace.trace_id}")
-    print(f"Response: {new_trace.response.text[:200]}...")
+    print(f"Response: {_ellipsize(new_trace.response.text, 200)}")
     
     return 0
 
@@ -239,9 +292,9 @@ def cmd_bless(args):
     
     # Confirm with user
     if not args.yes:
-        print("═" * 50)
+        print(_BAR_SHORT)
         print("⭐ BLESSING TRACE AS GOLDEN REFERENCE")
-        print("═" * 50)
+        print(_BAR_SHORT)
         print()
         print(f"Trace ID: {trace.trace_id}")
         print(f"Model: {trace.request.model}")
@@ -249,10 +302,10 @@ def cmd_bless(args):
         print()
         print("Input:")
         for msg in trace.request.messages[:2]:
-            print(f"  [{msg.role}]: {msg.content[:80]}...")
+            print(f"  [{msg.role}]: {_ellipsize(msg.content, 80)}")
         print()
         print("Output:")
-        print(f"  {trace.response.text[:100]}...")
+        print(f"  {_ellipsize(trace.response.text, 100)}")
         print()
         response = input("Bless this trace? (yes/no): ")
         if response.lower() not in ("yes", "y"):
@@ -272,6 +325,132 @@ def cmd_bless(args):
     return 0
 
 
+# Default number of golden traces replayed concurrently by `phylax check`.
+# Replays are network-bound provider calls, so threads overlap them well.
+_CHECK_WORKERS = 8
+
+
+def _check_adapters(traces) -> dict:
+    """
+    Create one adapter per provider used by the given traces.
+    
+    The adapters are shared by all `cmd_check` workers, so every replay for
+    a provider goes through the same client and its connection pool.
+    """
+    from sdk.adapters.openai import OpenAIAdapter
+    from sdk.adapters.gemini import GeminiAdapter
+    
+    adapter_classes = {"openai": OpenAIAdapter, "gemini": GeminiAdapter}
+    providers = {t.request.provider.lower() for t in traces}
+    return {p: adapter_classes[p]() for p in providers if p in adapter_classes}
+
+
+def _golden_hash(trace) -> str:
+    """
+    Output hash of a golden trace.
+    
+    The hash is recorded once at bless time; only traces blessed before
+    hashes were recorded need one computed now.
+    """
+    from server.storage.files import output_hash
+    
+    return (trace.metadata or {}).get("output_hash") or output_hash(trace.response.text)
+
+
+def _cached_check(trace, cache):
+    """
+    Look up a previous passing replay of a golden trace.
+    
+    An entry only counts while the golden trace is unchanged: same request
+    model and same output hash (re-blessing invalidates it).
+    
+    Returns:
+        The JSON report entry for the cached pass, or None
+    """
+    entry = cache.get(trace.trace_id)
+    if (
+        entry is None
+        or entry.get("model") != trace.request.model
+        or entry.get("original_hash") != _golden_hash(trace)
+    ):
+        return None
+    
+    return {
+        "trace_id": trace.trace_id,
+        "model": trace.request.model,
+        "provider": trace.request.provider,
+        "original_hash": entry["original_hash"],
+        "new_hash": entry["new_hash"],
+        "match": True,
+        "new_trace_id": entry.get("new_trace_id"),
+        "cached": True,
+    }
+
+
+def _check_golden(trace, storage, adapters):
+    """
+    Replay one golden trace and compare its output hash.
+    
+    Runs on a `cmd_check` worker thread, so it never prints and never
+    raises; errors are reported in the returned result.
+    
+    Args:
+        trace: The golden trace to replay
+        storage: FileStorage the replay is saved to
+        adapters: Provider name -> adapter, from `_check_adapters`
+    
+    Returns:
+        (result, new_trace) where result is the JSON report entry, or
+        (None, None) if the provider is not supported
+    """
+    from server.storage.files import output_hash
+    
+    try:
+        provider = trace.request.provider.lower()
+        adapter = adapters.get(provider)
+        messages, params = _replay_args(trace)
+        
+        if provider == "openai":
+            response, new_trace = adapter.chat_completion(
+                model=trace.request.model,
+                messages=messages,
+                **params,
+            )
+        elif provider == "gemini":
+            response, new_trace = adapter.chat_completion(
+                model=trace.request.model,
+                messages=messages,
+            )
+        else:
+            return None, None
+        
+        # Compare outputs
+        new_hash = output_hash(new_trace.response.text)
+        original_hash = _golden_hash(trace)
+        
+        result = {
+            "trace_id": trace.trace_id,
+            "model": trace.request.model,
+            "provider": trace.request.provider,
+            "original_hash": original_hash,
+            "new_hash": new_hash,
+            "match": new_hash == original_hash,
+            "new_trace_id": new_trace.trace_id,
+        }
+        
+        new_trace.replay_of = trace.trace_id
+        storage.save_trace(new_trace)
+        
+        return result, new_trace
+        
+    except Exception as e:
+        return {
+            "trace_id": trace.trace_id,
+            "model": trace.request.model,
+            "error": str(e),
+        }, None
+
+
 def cmd_check(args):
     """
     Check all blessed traces for regressions.
@@ -282,11 +461,8 @@ def cmd_check(args):
     
     This is the CI-safe command.
     """
-    import json as json_module
+    from concurrent.futures import ThreadPoolExecutor
     from server.storage.files import FileStorage
-    from sdk.adapters.openai import OpenAIAdapter
-    from sdk.adapters.gemini import GeminiAdapter
-    from sdk.expectations import evaluate
     
     storage = FileStorage()
     blessed_traces = storage.list_blessed_traces()
@@ -296,95 +472,88 @@ def cmd_check(args):
         print("   Use 'phylax bless <trace_id>' to mark a trace as golden.")
         return 0
     
-    print("═" * 60)
+    print(_BAR)
     print("🔍 PHYLAX CHECK - Replaying Golden Traces")
-    print("═" * 60)
+    print(_BAR)
     print(f"Found {len(blessed_traces)} blessed trace(s)")
     print()
     
     results = []
     failures = 0
     
-    for trace in blessed_traces:
-        print(f"Checking: {trace.trace_id[:20]}... ({trace.request.model})")
+    # Passing replays are remembered so `--cached` can skip them next time
+    check_cache = storage.load_check_cache()
+    cached = {}
+    if args.cached:
+        for trace in blessed_traces:
+            result = _cached_check(trace, check_cache)
+            if result is not None:
+                cached[trace.trace_id] = result
+    to_replay = [t for t in blessed_traces if t.trace_id not in cached]
+    
+    # Bounds in-flight provider calls (and so provider QPS)
+    adapters = _check_adapters(to_replay)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        # map() yields in input order, so the report reads as if serial
+        outcomes = executor.map(
+            lambda t: _check_golden(t, storage, adapters), to_replay
+        )
         
-        try:
-            # Get the adapter
-            provider = trace.request.provider.lower()
-            messages = [msg.model_dump() for msg in trace.request.messages]
+        for trace in blessed_traces:
+            print(f"Checking: {trace.trace_id[:20]}... ({trace.request.model})")
             
-            if provider == "openai":
-                adapter = OpenAIAdapter()
-                params = trace.request.parameters.model_dump(exclude_none=True)
-                response, new_trace = adapter.chat_completion(
-                    model=trace.request.model,
-                    messages=messages,
-                    **params,
-                )
-            elif provider == "gemini":
-                adapter = GeminiAdapter()
-                response, new_trace = adapter.chat_completion(
-                    model=trace.request.model,
-                    messages=messages,
-                )
-            else:
-                print(f"  ⚠️  Unsupported provider: {provider}")
+            if trace.trace_id in cached:
+                results.append(cached[trace.trace_id])
+                print(f"  ✅ PASS (cached)")
                 continue
             
-            # Compare outputs
-            import hashlib
-            new_hash = hashlib.sha256(new_trace.response.text.encode()).hexdigest()[:16]
-            original_hash = trace.metadata.get("output_hash", "") if trace.metadata else ""
+            result, new_trace = next(outcomes)
             
-            # Check if output matches
-            is_match = new_hash == original_hash
+            if result is None:
+                print(f"  ⚠️  Unsupported provider: {trace.request.provider.lower()}")
+                continue
             
-            result = {
-                "trace_id": trace.trace_id,
-                "model": trace.request.model,
-                "provider": trace.request.provider,
-                "original_hash": original_hash,
-                "new_hash": new_hash,
-                "match": is_match,
-                "new_trace_id": new_trace.trace_id,
-            }
             results.append(result)
             
-            new_trace.replay_of = trace.trace_id
-            storage.save_trace(new_trace)
-            
-            if is_match:
+            if "error" in result:
+                check_cache.pop(trace.trace_id, None)
+                print(f"  ❌ ERROR: {result['error']}")
+                failures += 1
+            elif result["match"]:
                 print(f"  ✅ PASS (output matches golden)")
+                check_cache[trace.trace_id] = {
+                    "model": result["model"],
+                    "original_hash": result["original_hash"],
+                    "new_hash": result["new_hash"],
+                    "new_trace_id": result["new_trace_id"],
+                    "checked_at": new_trace.timestamp,
+                }
             else:
+                check_cache.pop(trace.trace_id, None)
                 print(f"  ❌ FAIL (output differs from golden)")
-                print(f"     Original: {trace.response.text[:50]}...")
-                print(f"     New:      {new_trace.response.text[:50]}...")
+                print(f"     Original: {_ellipsize(trace.response.text, 50)}")
+                print(f"     New:      {_ellipsize(new_trace.response.text, 50)}")
                 failures += 1
-                
-        except Exception as e:
-            print(f"  ❌ ERROR: {e}")
-            results.append({
-                "trace_id": trace.trace_id,
-                "model": trace.request.model,
-                "error": str(e),
-            })
-            failures += 1
+    
+    storage.save_check_cache(check_cache)
     
     print()
-    print("═" * 60)
+    print(_BAR)
     
     if failures == 0:
         print(f"✅ ALL CHECKS PASSED ({len(blessed_traces)} traces)")
-        print("═" * 60)
+        print(_BAR)
     else:
         print(f"❌ {failures} CHECK(S) FAILED")
-        print("═" * 60)
+        print(_BAR)
     
     # Output JSON if requested
     if args.json:
+        import json
         print()
         print("JSON Report:")
-        print(json_module.dumps(results, indent=2))
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     
     return 1 if failures > 0 else 0
 
@@ -400,9 +569,9 @@ def cmd_graph_check(args):
     
     storage = FileStorage()
     
-    print("\n" + "═" * 60)
+    print("\n" + _BAR)
     print("🔍 PHYLAX GRAPH CHECK")
-    print("═" * 60 + "\n")
+    print(_BAR + "\n")
     
     # Get all executions
     executions = storage.list_executions()
@@ -432,83 +601,157 @@ def cmd_graph_check(args):
             print(f"   Tainted nodes: {verdict.tainted_count}")
             print(f"   Message: {verdict.message}")
     
-    print("\n" + "═" * 60)
+    print("\n" + _BAR)
     if failures == 0:
         print(f"✅ ALL {passed} EXECUTION(S) PASSED")
     else:
         print(f"❌ {failures} EXECUTION(S) FAILED")
-    print("═" * 60)
+    print(_BAR)
     
     return 1 if failures > 0 else 0
 
-def main():
-    """Main entry point."""
-    parser = argparse.ArgumentParser(
-        prog="phylax",
-        description="Developer-first local LLM tracing, replay & debugging system",
-    )
-    
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
-    
-    # init command
+def _positive_int(value):
+    """argparse type for options that must be >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _add_init_parser(subparsers):
     init_parser = subparsers.add_parser("init", help="Initialize Phylax")
     init_parser.add_argument("--force", "-f", action="store_true", help="Overwrite existing config")
-    
-    # server command
+
+
+def _add_server_parser(subparsers):
     server_parser = subparsers.add_parser("server", help="Start the trace server")
     server_parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     server_parser.add_argument("--port", "-p", type=int, default=8000, help="Port to bind to")
     server_parser.add_argument("--reload", "-r", action="store_true", help="Enable auto-reload")
-    
-    # list command
+
+
+def _add_list_parser(subparsers):
     list_parser = subparsers.add_parser("list", help="List traces")
     list_parser.add_argument("--limit", "-n", type=int, default=20, help="Max traces to show")
     list_parser.add_argument("--model", "-m", help="Filter by model")
     list_parser.add_argument("--provider", help="Filter by provider")
     list_parser.add_argument("--failed", "-f", action="store_true", help="Show only failed traces")
-    
-    # show command
+
+
+def _add_show_parser(subparsers):
     show_parser = subparsers.add_parser("show", help="Show a trace")
     show_parser.add_argument("trace_id", help="Trace ID to show")
     show_parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
-    
-    # replay command
+
+
+def _add_replay_parser(subparsers):
     replay_parser = subparsers.add_parser("replay", help="Replay a trace")
     replay_parser.add_argument("trace_id", help="Trace ID to replay")
     replay_parser.add_argument("--model", "-m", help="Override model")
     replay_parser.add_argument("--dry-run", "-d", action="store_true", help="Don't execute")
-    
-    # bless command - Phase 9
+
+
+def _add_bless_parser(subparsers):
+    # Phase 9
     bless_parser = subparsers.add_parser("bless", help="Mark a trace as golden reference")
     bless_parser.add_argument("trace_id", help="Trace ID to bless")
     bless_parser.add_argument("--force", action="store_true", help="Override existing golden for this model")
     bless_parser.add_argument("--yes", "-y", action="store_true", help="Skip confirmation")
-    
-    # check command - Phase 10 (CI-safe)
+
+
+def _add_check_parser(subparsers):
+    # Phase 10 (CI-safe)
     check_parser = subparsers.add_parser("check", help="Replay all golden traces (CI-safe)")
     check_parser.add_argument("--json", "-j", action="store_true", help="Output JSON report")
+    check_parser.add_argument(
+        "--concurrency", "-c", type=_positive_int, default=_CHECK_WORKERS,
+        help=f"Max golden traces replayed at once (default: {_CHECK_WORKERS})",
+    )
+    check_parser.add_argument(
+        "--cached", action="store_true",
+        help="Skip golden traces whose last replay passed and are unchanged since",
+    )
+
+
+def _add_graph_check_parser(subparsers):
+    # Phase 16 (graph-level CI)
+    subparsers.add_parser("graph-check", help="Check execution graphs (CI-safe)")
+
+
+# Subparser builders, in the order they appear in `phylax --help`
+_PARSER_BUILDERS = {
+    "init": _add_init_parser,
+    "server": _add_server_parser,
+    "list": _add_list_parser,
+    "show": _add_show_parser,
+    "replay": _add_replay_parser,
+    "bless": _add_bless_parser,
+    "check": _add_check_parser,
+    "graph-check": _add_graph_check_parser,
+}
+
+
+def _build_parser(command=None):
+    """
+    Build the argument parser.
+    
+    When `command` names a known subcommand only that subparser is built;
+    otherwise (no command, `--help`, or a typo) all of them are, so the
+    top-level help and "invalid choice" errors still list every command.
     
-    # graph-check command - Phase 16 (graph-level CI)
-    graph_check_parser = subparsers.add_parser("graph-check", help="Check execution graphs (CI-safe)")
+    Parsers are cached per subcommand, so repeated in-process calls to
+    `main()` (e.g. from a pytest suite) build each one only once.
+    """
+    return _cached_parser(command if command in _PARSER_BUILDERS else None)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_parser(command):
+    """Build and memoize the parser for `_build_parser`."""
+    parser = argparse.ArgumentParser(
+        prog="phylax",
+        description="Developer-first local LLM tracing, replay & debugging system",
+    )
     
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+    
+    if command in _PARSER_BUILDERS:
+        _PARSER_BUILDERS[command](subparsers)
+    else:
+        for build in _PARSER_BUILDERS.values():
+            build(subparsers)
+    
+    return parser
+
+
+def main(argv=None):
+    """Main entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = _build_parser(argv[0] if argv else None)
+    args = parser.parse_args(argv)
     
     if args.command is None:
         parser.print_help()
         return 0
     
-    commands = {
-        "init": cmd_init,
-        "server": cmd_server,
-        "list": cmd_list,
-        "show": cmd_show,
-        "replay": cmd_replay,
-        "bless": cmd_bless,
-        "check": cmd_check,
-        "graph-check": cmd_graph_check,
-    }
-    
-    return commands[args.command](args)
+    if args.command == "init":
+        return cmd_init(args)
+    elif args.command == "server":
+        return cmd_server(args)
+    elif args.command == "list":
+        return cmd_list(args)
+    elif args.command == "show":
+        return cmd_show(args)
+    elif args.command == "replay":
+        return cmd_replay(args)
+    elif args.command == "bless":
+        return cmd_bless(args)
+    elif args.command == "check":
+        return cmd_check(args)
+    elif args.command == "graph-check":
+        return cmd_graph_check(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+"""
+Phylax examples.
+
+Run from the project root as modules, e.g.:
+    python -m examples.test_graph_unit
+"""
@@ -10,8 +10,6 @@ Demonstrates:
 import os
 import sys
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import sdk
 from sdk.decorator import trace
 from sdk.adapters.gemini import GeminiAdapter
@@ -7,9 +7,6 @@ Demonstrates how to use @trace and @expect decorators together.
 import os
 import sys
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from sdk.decorator import trace, expect
 from sdk.adapters.gemini import GeminiAdapter
 
@@ -9,17 +9,12 @@ Usage:
     $env:GOOGLE_API_KEY = "your-api-key-here"
     
     # Run the script
-    python examples/test_gemini_call.py
+    python -m examples.test_gemini_call
 """
 
 import os
 import sys
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from sdk.adapters.gemini import GeminiAdapter
-
 
 def main():
     # Check for API key
@@ -39,6 +34,8 @@ def main():
     print()
     
     # Create adapter (this automatically captures traces)
+    from sdk.adapters.gemini import GeminiAdapter
+    
     adapter = GeminiAdapter(api_key=api_key)
     
     # Define the messages
@@ -4,15 +4,36 @@ Test Script: Phase 13-18 Graph Features (ASCII output)
 
 import os
 import sys
-import uuid
 from datetime import datetime
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from sdk.schema import Trace, TraceRequest, TraceResponse, TraceMessage, Verdict, TraceRuntime
 from sdk.graph import ExecutionGraph
 
 
+# Random 128-bit hex ids, cut from one urandom read per refill
+_ID_POOL: list[str] = []
+
+
+def _new_id() -> str:
+    """Return a fresh random id (32 hex chars, like uuid4().hex)."""
+    if not _ID_POOL:
+        buf = os.urandom(16 * 256)
+        _ID_POOL.extend(buf[i:i + 16].hex() for i in range(0, len(buf), 16))
+    return _ID_POOL.pop()
+
+
+# Shared, validated building blocks for create_mock_trace
+_TEMPLATE = Trace(
+    request=TraceRequest(provider="test", model="test-model", messages=[]),
+    response=TraceResponse(text="", latency_ms=0),
+    runtime=TraceRuntime(library="test", version="1.0.0"),
+)
+_VERDICTS = {
+    "pass": Verdict(status="pass", violations=[]),
+    "fail": Verdict(status="fail", violations=["test violation"]),
+}
+
+
 def create_mock_trace(
     execution_id,
     node_id,
@@ -20,101 +41,99 @@ def create_mock_trace(
     latency_ms=100,
     verdict_status="pass"
 ):
-    """Create a mock trace for testing."""
-    return Trace(
-        trace_id=str(uuid.uuid4()),
-        execution_id=execution_id,
-        node_id=node_id,
-        parent_node_id=parent_node_id,
-        request=TraceRequest(
-            provider="test",
-            model="test-model",
-            messages=[TraceMessage(role="user", content=f"Node {node_id[:8]}")]
-        ),
-        response=TraceResponse(
-            text=f"Response for {node_id[:8]}",
-            latency_ms=latency_ms
-        ),
-        runtime=TraceRuntime(
-            library="test",
-            version="1.0.0"
-        ),
-        verdict=Verdict(
-            status=verdict_status,
-            violations=[] if verdict_status == "pass" else ["test violation"]
-        ) if verdict_status else None
-    )
+    """
+    Create a mock trace for testing.
+    
+    Copies a validated template, replacing only the per-node fields, so
+    each mock skips rebuilding and re-validating the nested models.
+    """
+    short_id = node_id[:8]
+    return _TEMPLATE.model_copy(update={
+        "trace_id": _new_id(),
+        "execution_id": execution_id,
+        "node_id": node_id,
+        "parent_node_id": parent_node_id,
+        "request": _TEMPLATE.request.model_copy(update={
+            "messages": [TraceMessage(role="user", content=f"Node {short_id}")],
+        }),
+        "response": _TEMPLATE.response.model_copy(update={
+            "text": f"Response for {short_id}",
+            "latency_ms": latency_ms,
+        }),
+        "verdict": _VERDICTS.get(verdict_status),
+    })
+
+
+class _Section:
+    """One phase's output, buffered and written with a single call."""
+    
+    def __init__(self, title, rule="="):
+        self.lines = ["", rule * 60, title, rule * 60]
+    
+    def line(self, text):
+        self.lines.append(text)
+    
+    def flush(self):
+        sys.stdout.write("\n".join(self.lines) + "\n")
 
 
 def main():
-    print("")
-    print("#" * 60)
-    print("  Phylax PHASE 13-18 GRAPH FEATURES TEST")
-    print("#" * 60)
+    _Section("  Phylax PHASE 13-18 GRAPH FEATURES TEST", rule="#").flush()
     
     # Phase 13: Create traces with causality
-    print("")
-    print("=" * 60)
-    print("PHASE 13: EXECUTION CONTEXT & CAUSALITY")
-    print("=" * 60)
+    sec = _Section("PHASE 13: EXECUTION CONTEXT & CAUSALITY")
     
-    exec_id = str(uuid.uuid4())
-    node1 = str(uuid.uuid4())
-    node2 = str(uuid.uuid4())
-    node3 = str(uuid.uuid4())
+    exec_id = _new_id()
+    node1 = _new_id()
+    node2 = _new_id()
+    node3 = _new_id()
     
     trace1 = create_mock_trace(exec_id, node1, None, 100)
     trace2 = create_mock_trace(exec_id, node2, node1, 200)
     trace3 = create_mock_trace(exec_id, node3, node1, 150)
     traces = [trace1, trace2, trace3]
     
-    print(f"[OK] Created execution: {exec_id[:20]}...")
-    print(f"[OK] Node 1 (root): {node1[:20]}...")
-    print(f"[OK] Node 2 (child of 1): {node2[:20]}...")
-    print(f"[OK] Node 3 (child of 1): {node3[:20]}...")
-    print(f"[OK] All traces share same execution_id")
+    sec.line(f"[OK] Created execution: {exec_id[:20]}...")
+    sec.line(f"[OK] Node 1 (root): {node1[:20]}...")
+    sec.line(f"[OK] Node 2 (child of 1): {node2[:20]}...")
+    sec.line(f"[OK] Node 3 (child of 1): {node3[:20]}...")
+    sec.line("[OK] All traces share same execution_id")
+    sec.flush()
     
     # Phase 14: Build graph
-    print("")
-    print("=" * 60)
-    print("PHASE 14: GRAPH CONSTRUCTION")
-    print("=" * 60)
+    sec = _Section("PHASE 14: GRAPH CONSTRUCTION")
     
     graph = ExecutionGraph.from_traces(traces)
     
-    print(f"[OK] Built ExecutionGraph")
-    print(f"   - Nodes: {graph.node_count}")
-    print(f"   - Edges: {len(graph.edges)}")
-    print(f"   - Root node: {graph.root_node_id[:20]}...")
-    print(f"   - Total latency: {graph.total_latency_ms}ms")
+    sec.line("[OK] Built ExecutionGraph")
+    sec.line(f"   - Nodes: {graph.node_count}")
+    sec.line(f"   - Edges: {len(graph.edges)}")
+    sec.line(f"   - Root node: {graph.root_node_id[:20]}...")
+    sec.line(f"   - Total latency: {graph.total_latency_ms}ms")
     
     children = graph.get_children(traces[0].node_id)
-    print(f"[OK] Node 1 has {len(children)} children")
+    sec.line(f"[OK] Node 1 has {len(children)} children")
     
     topo = graph.topological_order()
-    print(f"[OK] Topological order has {len(topo)} nodes")
+    sec.line(f"[OK] Topological order has {len(topo)} nodes")
+    sec.flush()
     
     # Phase 16: Test verdict (pass case)
-    print("")
-    print("=" * 60)
-    print("PHASE 16: GRAPH VERDICT (ALL PASS)")
-    print("=" * 60)
+    sec = _Section("PHASE 16: GRAPH VERDICT (ALL PASS)")
     
     verdict = graph.compute_verdict()
-    print(f"[OK] Graph verdict: {verdict.status.upper()}")
-    print(f"   - Message: {verdict.message}")
-    print("[PASS] Verdict correctly computed as PASS")
+    sec.line(f"[OK] Graph verdict: {verdict.status.upper()}")
+    sec.line(f"   - Message: {verdict.message}")
+    sec.line("[PASS] Verdict correctly computed as PASS")
+    sec.flush()
     
     # Phase 16: Test verdict (fail case)
-    print("")
-    print("=" * 60)
-    print("PHASE 16: GRAPH VERDICT (WITH FAILURE)")
-    print("=" * 60)
+    sec = _Section("PHASE 16: GRAPH VERDICT (WITH FAILURE)")
     
-    exec_id2 = str(uuid.uuid4())
-    n1 = str(uuid.uuid4())
-    n2 = str(uuid.uuid4())
-    n3 = str(uuid.uuid4())
+    exec_id2 = _new_id()
+    n1 = _new_id()
+    n2 = _new_id()
+    n3 = _new_id()
     
     fail_traces = [
         create_mock_trace(exec_id2, n1, None, 100, "pass"),
@@ -123,48 +142,44 @@ def main():
     ]
     
     fail_graph = ExecutionGraph.from_traces(fail_traces)
-    fail_verdict = fail_graph.compute_verdict()
+    analysis = fail_graph.analyze(top_n=3)
+    fail_verdict = analysis["verdict"]
     
-    print(f"[OK] Graph verdict: {fail_verdict.status.upper()}")
-    print(f"   - Root cause: {fail_verdict.root_cause_node[:20]}...")
-    print(f"   - Failed count: {fail_verdict.failed_count}")
-    print(f"   - Tainted count: {fail_verdict.tainted_count}")
-    print("[PASS] Verdict correctly identifies root cause!")
+    sec.line(f"[OK] Graph verdict: {fail_verdict.status.upper()}")
+    sec.line(f"   - Root cause: {fail_verdict.root_cause_node[:20]}...")
+    sec.line(f"   - Failed count: {fail_verdict.failed_count}")
+    sec.line(f"   - Tainted count: {fail_verdict.tainted_count}")
+    sec.line("[PASS] Verdict correctly identifies root cause!")
     
     tainted = fail_graph.get_tainted_nodes(n2)
-    print(f"[OK] Blast radius from node2: {len(tainted)} nodes affected")
+    sec.line(f"[OK] Blast radius from node2: {len(tainted)} nodes affected")
+    sec.flush()
     
     # Phase 18: Performance analysis
-    print("")
-    print("=" * 60)
-    print("PHASE 18: PERFORMANCE ANALYSIS")
-    print("=" * 60)
-    
-    cp = fail_graph.critical_path()
-    print(f"[OK] Critical path:")
-    print(f"   - Length: {len(cp['path'])} nodes")
-    print(f"   - Total latency: {cp['total_latency_ms']}ms")
-    print(f"   - Bottleneck: {cp['bottleneck_node'][:20]}...")
-    print(f"   - Bottleneck latency: {cp['bottleneck_latency_ms']}ms")
-    
-    bottlenecks = fail_graph.find_bottlenecks(top_n=3)
-    print(f"[OK] Top bottlenecks:")
+    sec = _Section("PHASE 18: PERFORMANCE ANALYSIS")
+    
+    cp = analysis["critical_path"]
+    sec.line("[OK] Critical path:")
+    sec.line(f"   - Length: {len(cp['path'])} nodes")
+    sec.line(f"   - Total latency: {cp['total_latency_ms']}ms")
+    sec.line(f"   - Bottleneck: {cp['bottleneck_node'][:20]}...")
+    sec.line(f"   - Bottleneck latency: {cp['bottleneck_latency_ms']}ms")
+    
+    bottlenecks = analysis["bottlenecks"]
+    sec.line("[OK] Top bottlenecks:")
     for i, b in enumerate(bottlenecks, 1):
-        print(f"   {i}. {b['label'][:25]}... - {b['latency_ms']}ms ({b['percent_of_total']}%)")
+        sec.line(f"   {i}. {b['label'][:25]}... - {b['latency_ms']}ms ({b['percent_of_total']}%)")
+    sec.flush()
     
     # Summary
-    print("")
-    print("=" * 60)
-    print("PHASE 15 & 17: UI/API FEATURES")
-    print("=" * 60)
-    print("-> Phase 15 (Graph Visualization): Check UI 'Graph' tab")
-    print("-> Phase 17 (Subgraph Replay): POST /v1/executions/{id}/replay")
-    
-    print("")
-    print("#" * 60)
-    print("  [PASS] ALL PHASE 13-18 UNIT TESTS PASSED!")
-    print("#" * 60)
-    print("")
+    sec = _Section("PHASE 15 & 17: UI/API FEATURES")
+    sec.line("-> Phase 15 (Graph Visualization): Check UI 'Graph' tab")
+    sec.line("-> Phase 17 (Subgraph Replay): POST /v1/executions/{id}/replay")
+    sec.flush()
+    
+    sec = _Section("  [PASS] ALL PHASE 13-18 UNIT TESTS PASSED!", rule="#")
+    sec.line("")
+    sec.flush()
     
     return 0
 
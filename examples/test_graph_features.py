@@ -10,57 +10,84 @@ Tests:
 - Phase 18: Performance analysis
 """
 
+import argparse
+import asyncio
 import os
 import sys
 import time
-import requests
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+API_BASE = "http://127.0.0.1:8000/v1"
 
-import sdk
-from sdk.decorator import trace, expect
-from sdk.adapters.gemini import GeminiAdapter
 
-API_BASE = "http://127.0.0.1:8000/v1"
+# One adapter for all steps, so its client is set up once per run
+_ADAPTER = None
+
+
+def _get_adapter():
+    """Return the shared GeminiAdapter, creating it on first use."""
+    global _ADAPTER
+    if _ADAPTER is None:
+        from sdk.adapters.gemini import GeminiAdapter
+        _ADAPTER = GeminiAdapter()
+    return _ADAPTER
 
 
 # =============================================================================
 # Test Functions with @trace decorator
 # =============================================================================
 
-@trace(provider="gemini")
-@expect(must_include=["4"])  # 2+2=4
-def step_1_calculate():
-    """Step 1: Simple calculation."""
-    adapter = GeminiAdapter()
-    response, _ = adapter.generate(
-        prompt="What is 2 + 2? Answer with just the number.",
-        model="gemini-2.5-flash",
-    )
-    return response
+# Built on first use, so an early exit (no API key) never imports the sdk
+_STEPS = None
 
 
-@trace(provider="gemini")
-@expect(must_include=["correct", "yes"], max_latency_ms=5000)
-def step_2_verify(previous_answer):
-    """Step 2: Verify the answer."""
-    adapter = GeminiAdapter()
-    response, _ = adapter.generate(
-        prompt=f"Is {previous_answer} the correct answer to 2+2? Reply Yes or No.",
-        model="gemini-2.5-flash",
-    )
-    return response
+def _get_steps():
+    """Return the three traced steps, defining them on first use."""
+    global _STEPS
+    if _STEPS is not None:
+        return _STEPS
+    
+    from sdk.decorator import trace, expect
+    
+    @trace(provider="gemini")
+    @expect(must_include=["4"])  # 2+2=4
+    def step_1_calculate():
+        """Step 1: Simple calculation."""
+        response, _ = _get_adapter().generate(
+            prompt="What is 2 + 2? Answer with just the number.",
+            model="gemini-2.5-flash",
+        )
+        return response
+    
+    @trace(provider="gemini")
+    @expect(must_include=["correct", "yes"], max_latency_ms=5000)
+    def step_2_verify(previous_answer):
+        """Step 2: Verify the answer."""
+        response, _ = _get_adapter().generate(
+            prompt=f"Is {previous_answer} the correct answer to 2+2? Reply Yes or No.",
+            model="gemini-2.5-flash",
+        )
+        return response
+    
+    @trace(provider="gemini")
+    def step_3_summarize(result):
+        """Step 3: Summarize results."""
+        response, _ = _get_adapter().generate(
+            prompt=f"Summarize this verification: {result}",
+            model="gemini-2.5-flash",
+        )
+        return response
+    
+    _STEPS = (step_1_calculate, step_2_verify, step_3_summarize)
+    return _STEPS
 
 
-@trace(provider="gemini")
-def step_3_summarize(result):
-    """Step 3: Summarize results."""
-    adapter = GeminiAdapter()
-    response, _ = adapter.generate(
-        prompt=f"Summarize this verification: {result}",
-        model="gemini-2.5-flash",
-    )
-    return response
+def _run_chain():
+    """Run the three chained steps; returns their results in order."""
+    step_1_calculate, step_2_verify, step_3_summarize = _get_steps()
+    result1 = step_1_calculate()
+    result2 = step_2_verify(result1.text)
+    result3 = step_3_summarize(result2.text)
+    return result1, result2, result3
 
 
 def test_phase_13_execution_context():
@@ -69,36 +96,115 @@ def test_phase_13_execution_context():
     print("PHASE 13: EXECUTION CONTEXT TEST")
     print("=" * 60)
     
+    import sdk
+    
     with sdk.execution() as exec_id:
         print(f"✓ Created execution context: {exec_id[:20]}...")
         
         # Run chained steps
-        result1 = step_1_calculate()
+        result1, result2, result3 = _run_chain()
         print(f"✓ Step 1 completed: {result1.text[:30]}...")
-        
-        result2 = step_2_verify(result1.text)
         print(f"✓ Step 2 completed: {result2.text[:30]}...")
-        
-        result3 = step_3_summarize(result2.text)
         print(f"✓ Step 3 completed: {result3.text[:30]}...")
     
     print(f"\n✅ All 3 traces share execution_id: {exec_id[:20]}...")
     return exec_id
 
 
-def test_phase_14_graph_api(execution_id):
+async def _run_execution_async(i):
+    """
+    Run one execution's chain on a worker thread.
+    
+    The steps within a chain stay serial (each needs the previous
+    answer); asyncio.to_thread copies the task's context, so the
+    execution_id set here is seen by the traced steps.
+    """
+    import sdk
+    
+    with sdk.execution() as exec_id:
+        await asyncio.to_thread(_run_chain)
+    print(f"✓ Execution {i + 1} completed: {exec_id[:20]}...")
+    return exec_id
+
+
+def _run_parallel(n):
+    """Test Phase 13: N independent executions, run concurrently."""
+    print("\n" + "=" * 60)
+    print(f"PHASE 13: {n} PARALLEL EXECUTIONS")
+    print("=" * 60)
+    
+    async def run_all():
+        return await asyncio.gather(*(_run_execution_async(i) for i in range(n)))
+    
+    _get_steps()  # define the steps once, before the worker threads race for them
+    start = time.perf_counter()
+    exec_ids = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+    
+    print(f"\n✅ {n} executions finished in {elapsed:.1f}s, each with its own execution_id")
+    return exec_ids
+
+
+def _wait_ready(execution_id, expected, timeout=2.0):
+    """Poll the API until the execution has `expected` traces, or time out."""
+    import requests
+    
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        try:
+            # A stuck request must not outlive the polling deadline
+            resp = requests.get(f"{API_BASE}/executions/{execution_id}", timeout=remaining)
+            if resp.ok and resp.json().get("count", 0) >= expected:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.02)
+
+
+def _fetch_all(execution_id):
+    """
+    Fetch every endpoint the graph tests read, concurrently and once.
+    
+    Returns:
+        dict of responses keyed by "executions", "execution", "graph"
+        and "analysis"
+    """
+    paths = {
+        "executions": "/executions",
+        "execution": f"/executions/{execution_id}",
+        "graph": f"/executions/{execution_id}/graph",
+        "analysis": f"/executions/{execution_id}/analysis",
+    }
+    
+    try:
+        import httpx
+    except ImportError:
+        # Fall back to serial requests over one keep-alive session
+        import requests
+        with requests.Session() as session:
+            return {k: session.get(f"{API_BASE}{p}") for k, p in paths.items()}
+    
+    async def gather():
+        async with httpx.AsyncClient(base_url=API_BASE) as client:
+            responses = await asyncio.gather(*(client.get(p) for p in paths.values()))
+        return dict(zip(paths, responses))
+    
+    return asyncio.run(gather())
+
+
+def test_phase_14_graph_api(execution_id, responses):
     """Test Phase 14: Graph construction API."""
     print("\n" + "=" * 60)
     print("PHASE 14: GRAPH CONSTRUCTION TEST")
     print("=" * 60)
     
     # Test /v1/executions endpoint
-    resp = requests.get(f"{API_BASE}/executions")
+    resp = responses["executions"]
     data = resp.json()
     print(f"✓ GET /v1/executions returned {data['count']} executions")
     
     # Test /v1/executions/{id} endpoint
-    resp = requests.get(f"{API_BASE}/executions/{execution_id}")
+    resp = responses["execution"]
     if resp.status_code == 200:
         data = resp.json()
         print(f"✓ GET /v1/executions/{execution_id[:12]}... returned {data['count']} traces")
@@ -106,7 +212,7 @@ def test_phase_14_graph_api(execution_id):
         print(f"✗ GET /v1/executions/{execution_id[:12]}... failed: {resp.status_code}")
     
     # Test /v1/executions/{id}/graph endpoint
-    resp = requests.get(f"{API_BASE}/executions/{execution_id}/graph")
+    resp = responses["graph"]
     if resp.status_code == 200:
         graph = resp.json()
         print(f"✓ GET /v1/executions/{execution_id[:12]}../graph:")
@@ -119,13 +225,13 @@ def test_phase_14_graph_api(execution_id):
         return None
 
 
-def test_phase_16_graph_verdict(execution_id):
+def test_phase_16_graph_verdict(execution_id, responses):
     """Test Phase 16: Graph-level judgment."""
     print("\n" + "=" * 60)
     print("PHASE 16: GRAPH VERDICT TEST")
     print("=" * 60)
     
-    resp = requests.get(f"{API_BASE}/executions/{execution_id}/graph")
+    resp = responses["graph"]
     if resp.status_code != 200:
         print(f"✗ Could not load graph")
         return
@@ -133,7 +239,7 @@ def test_phase_16_graph_verdict(execution_id):
     graph = resp.json()
     
     # The verdict is computed by the Python model, test via analysis endpoint
-    resp = requests.get(f"{API_BASE}/executions/{execution_id}/analysis")
+    resp = responses["analysis"]
     if resp.status_code == 200:
         analysis = resp.json()
         verdict = analysis.get('verdict', {})
@@ -146,13 +252,13 @@ def test_phase_16_graph_verdict(execution_id):
         print(f"✗ Analysis API failed: {resp.status_code}")
 
 
-def test_phase_18_performance_analysis(execution_id):
+def test_phase_18_performance_analysis(execution_id, responses):
     """Test Phase 18: Performance analysis."""
     print("\n" + "=" * 60)
     print("PHASE 18: PERFORMANCE ANALYSIS TEST")
     print("=" * 60)
     
-    resp = requests.get(f"{API_BASE}/executions/{execution_id}/analysis")
+    resp = responses["analysis"]
     if resp.status_code != 200:
         print(f"✗ Analysis API failed: {resp.status_code}")
         return
@@ -187,7 +293,14 @@ def test_phase_15_ui_notice():
     print("→ Failed nodes show in RED, tainted nodes show ⚠️ badge")
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phase 13-18 graph features test")
+    parser.add_argument(
+        "--parallel", type=int, default=1, metavar="N",
+        help="Run N independent executions concurrently (default: 1)",
+    )
+    args = parser.parse_args(argv)
+    
     # Check API key
     api_key = os.environ.get("GOOGLE_API_KEY")
     if not api_key:
@@ -200,14 +313,19 @@ def main():
     print("█" * 60)
     
     # Run tests
-    execution_id = test_phase_13_execution_context()
-    
-    # Wait for traces to be saved
-    time.sleep(1)
+    if args.parallel > 1:
+        execution_ids = _run_parallel(args.parallel)
+    else:
+        execution_ids = [test_phase_13_execution_context()]
     
-    graph = test_phase_14_graph_api(execution_id)
-    test_phase_16_graph_verdict(execution_id)
-    test_phase_18_performance_analysis(execution_id)
+    for execution_id in execution_ids:
+        # Wait for traces to be saved
+        _wait_ready(execution_id, expected=3)
+        
+        responses = _fetch_all(execution_id)
+        graph = test_phase_14_graph_api(execution_id, responses)
+        test_phase_16_graph_verdict(execution_id, responses)
+        test_phase_18_performance_analysis(execution_id, responses)
     test_phase_15_ui_notice()
     
     print("\n" + "█" * 60)
@@ -9,17 +9,12 @@ Usage:
     $env:OPENAI_API_KEY = "your-api-key-here"
     
     # Run the script
-    python examples/test_openai_call.py
+    python -m examples.test_openai_call
 """
 
 import os
 import sys
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from sdk.adapters.openai import OpenAIAdapter
-
 
 def main():
     # Check for API key
@@ -37,6 +32,8 @@ def main():
     print()
     
     # Create adapter (this automatically captures traces)
+    from sdk.adapters.openai import OpenAIAdapter
+    
     adapter = OpenAIAdapter(api_key=api_key)
     
     # Define the messages
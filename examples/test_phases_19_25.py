@@ -4,15 +4,16 @@ Comprehensive test for all advanced graph features.
 """
 
 import sys
-import os
 import uuid
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from sdk.schema import Trace, TraceRequest, TraceResponse, TraceMessage, Verdict, TraceRuntime
 from sdk.graph import ExecutionGraph, NodeRole, GraphStage, GraphDiff, NodeDiff
 
 
+# Verdict is frozen, so one instance per status can be shared by all traces
+_VERDICTS = {status: Verdict(status=status, violations=[]) for status in ("pass", "fail")}
+
+
 def create_trace(exec_id, node_id, parent_id=None, latency=100, status='pass', content='test'):
     return Trace(
         trace_id=str(uuid.uuid4()),
@@ -23,7 +24,7 @@ def create_trace(exec_id, node_id, parent_id=None, latency=100, status='pass', c
                             messages=[TraceMessage(role='user', content=content)]),
         response=TraceResponse(text='response', latency_ms=latency),
         runtime=TraceRuntime(library='test', version='1.0'),
-        verdict=Verdict(status=status, violations=[])
+        verdict=_VERDICTS[status]
     )
 
 
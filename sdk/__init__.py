@@ -7,11 +7,12 @@ This package provides the core capture layer for tracing LLM calls.
 from sdk.schema import Trace, TraceRequest, TraceResponse, TraceRuntime, Verdict
 from sdk.decorator import trace, expect
 from sdk.capture import CaptureLayer
+from sdk.cache import ResponseCache
 from sdk.context import execution  # Phase 13: Execution context
-from sdk.graph import ExecutionGraph, NodeRole, GraphStage, GraphDiff, NodeDiff  # Phase 14+
+from sdk.parallel import parallel_map
 
 __version__ = "1.0.0"
-__all__ = [
+__all__ = (
     "Trace",
     "TraceRequest",
     "TraceResponse",
@@ -20,10 +21,27 @@ __all__ = [
     "trace",
     "expect",
     "CaptureLayer",
+    "ResponseCache",
     "execution",      # Phase 13
+    "parallel_map",
     "ExecutionGraph", # Phase 14
     "NodeRole",       # Phase 19
     "GraphStage",     # Phase 20
     "GraphDiff",      # Phase 23
     "NodeDiff",       # Phase 23
-]
+)
+
+# Phase 14+: graph types load from sdk.graph on first access, so tracing
+# alone does not pay for building the graph models
+_GRAPH_EXPORTS = {"ExecutionGraph", "NodeRole", "GraphStage", "GraphDiff", "NodeDiff"}
+
+
+def __getattr__(name):
+    if name in _GRAPH_EXPORTS:
+        from sdk import graph
+        return getattr(graph, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _GRAPH_EXPORTS)
@@ -4,12 +4,74 @@ Gemini Adapter
 Provides integration with Google's Gemini API.
 """
 
+import threading
+from functools import partial
 from typing import Any, Optional
 
 from sdk.capture import CaptureLayer, get_capture_layer
 from sdk.schema import Trace
 
 
+# google.generativeai, imported once per process, and the API key it was
+# last configured with (genai.configure sets process-wide state)
+_genai = None
+_configured_key: Optional[str] = None
+_genai_lock = threading.Lock()
+
+
+def _get_genai(api_key: Optional[str]):
+    """Import google.generativeai on first use and configure it for api_key."""
+    global _genai, _configured_key
+    if _genai is not None and (not api_key or api_key == _configured_key):
+        return _genai
+    
+    with _genai_lock:
+        if _genai is None:
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                raise ImportError(
+                    "google-generativeai package not installed. "
+                    "Install with: pip install google-generativeai"
+                )
+            _genai = genai
+        
+        if api_key and api_key != _configured_key:
+            _genai.configure(api_key=api_key)
+            _configured_key = api_key
+    
+    return _genai
+
+
+def _to_gemini_contents(messages: list[dict[str, str]]) -> list[dict[str, Any]]:
+    """
+    Convert chat messages to Gemini contents.
+    
+    Gemini has no system role: system messages are prepended to the parts
+    of the next user message (or sent as a user turn if none follows).
+    Assistant messages map to the "model" role.
+    """
+    contents = []
+    system_parts = []
+    
+    for msg in messages:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        
+        if role == "system":
+            system_parts.append(content)
+        elif role == "assistant":
+            contents.append({"role": "model", "parts": [content]})
+        else:
+            contents.append({"role": "user", "parts": [*system_parts, content]})
+            system_parts = []
+    
+    if system_parts:
+        contents.append({"role": "user", "parts": system_parts})
+    
+    return contents
+
+
 class GeminiAdapter:
     """
     Adapter for Google Gemini API.
@@ -36,22 +98,32 @@ class GeminiAdapter:
         """
         self.api_key = api_key
         self.capture_layer = capture_layer or get_capture_layer()
-        self._client = None
+        self._models: dict[str, Any] = {}
     
     def _get_client(self, model: str):
-        """Get or create the Gemini client."""
-        try:
-            import google.generativeai as genai
-            
-            if self.api_key:
-                genai.configure(api_key=self.api_key)
-            
-            return genai.GenerativeModel(model)
-        except ImportError:
-            raise ImportError(
-                "google-generativeai package not installed. "
-                "Install with: pip install google-generativeai"
-            )
+        """Get or create the Gemini client for a model."""
+        genai = _get_genai(self.api_key)
+        client = self._models.get(model)
+        if client is None:
+            client = self._models[model] = genai.GenerativeModel(model)
+        return client
+    
+    def _invoke_chat(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+    ) -> Any:
+        """Make the raw generate_content call (the capture layer's call_fn)."""
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+        return self._get_client(model).generate_content(
+            _to_gemini_contents(messages),
+            generation_config=generation_config,
+        )
     
     def chat_completion(
         self,
@@ -81,45 +153,12 @@ class GeminiAdapter:
             **kwargs,
         }
         
-        def make_call():
-            client = self._get_client(model)
-            
-            # Convert messages to Gemini format
-            # Gemini uses a different format - combine into a single prompt or use chat
-            contents = []
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                
-                # Map roles to Gemini format
-                if role == "system":
-                    # Prepend system message to first user message
-                    contents.append({"role": "user", "parts": [content]})
-                elif role == "assistant":
-                    contents.append({"role": "model", "parts": [content]})
-                else:
-                    contents.append({"role": "user", "parts": [content]})
-            
-            # Create generation config
-            generation_config = {
-                "temperature": temperature,
-                "max_output_tokens": max_tokens,
-            }
-            
-            # Make the call
-            response = client.generate_content(
-                contents,
-                generation_config=generation_config,
-            )
-            
-            return response
-        
         response, trace = self.capture_layer.capture(
             provider="gemini",
             model=model,
             messages=messages,
             parameters=parameters,
-            call_fn=make_call,
+            call_fn=partial(self._invoke_chat, model, messages, temperature, max_tokens),
         )
         
         return response, trace
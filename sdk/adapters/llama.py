@@ -5,6 +5,7 @@ Provides integration with llama.cpp Python bindings.
 Stub implementation for initial release.
 """
 
+from functools import partial
 from typing import Any, Optional
 
 from sdk.capture import CaptureLayer, get_capture_layer
@@ -63,6 +64,14 @@ class LlamaAdapter:
                 )
         return self._llm
     
+    def _invoke_chat(self, messages: list[dict[str, str]], parameters: dict) -> Any:
+        """Make the raw chat completion call (the capture layer's call_fn)."""
+        return self.llm.create_chat_completion(messages=messages, **parameters)
+    
+    def _invoke_completion(self, prompt: str, parameters: dict) -> Any:
+        """Make the raw completion call (the capture layer's call_fn)."""
+        return self.llm(prompt, **parameters)
+    
     def chat_completion(
         self,
         messages: list[dict[str, str]],
@@ -88,14 +97,6 @@ class LlamaAdapter:
             **kwargs,
         }
         
-        def make_call():
-            return self.llm.create_chat_completion(
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
-            )
-        
         # Extract model name from path
         model_name = self.model_path.split("/")[-1] if self.model_path else "unknown"
         
@@ -104,7 +105,7 @@ class LlamaAdapter:
             model=model_name,
             messages=messages,
             parameters=parameters,
-            call_fn=make_call,
+            call_fn=partial(self._invoke_chat, messages, parameters),
         )
         
         return response, trace
@@ -136,14 +137,6 @@ class LlamaAdapter:
             **kwargs,
         }
         
-        def make_call():
-            return self.llm(
-                prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
-            )
-        
         model_name = self.model_path.split("/")[-1] if self.model_path else "unknown"
         
         response, trace = self.capture_layer.capture(
@@ -151,7 +144,7 @@ class LlamaAdapter:
             model=model_name,
             messages=messages,
             parameters=parameters,
-            call_fn=make_call,
+            call_fn=partial(self._invoke_completion, prompt, parameters),
         )
         
         return response, trace
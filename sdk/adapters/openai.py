@@ -5,6 +5,7 @@ Provides integration with the OpenAI Python client.
 Normalizes request/response shapes to the standard trace schema.
 """
 
+from functools import partial
 from typing import Any, Optional
 
 from sdk.capture import CaptureLayer, get_capture_layer
@@ -53,6 +54,14 @@ class OpenAIAdapter:
                 )
         return self._client
     
+    def _invoke_chat(self, model: str, messages: list[dict[str, str]], parameters: dict) -> Any:
+        """Make the raw chat completion call (the capture layer's call_fn)."""
+        return self.client.chat.completions.create(model=model, messages=messages, **parameters)
+    
+    def _invoke_completion(self, model: str, prompt: str, parameters: dict) -> Any:
+        """Make the raw completion call (the capture layer's call_fn)."""
+        return self.client.completions.create(model=model, prompt=prompt, **parameters)
+    
     def chat_completion(
         self,
         model: str,
@@ -80,21 +89,12 @@ class OpenAIAdapter:
             **kwargs,
         }
         
-        def make_call():
-            return self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
-            )
-        
         response, trace = self.capture_layer.capture(
             provider="openai",
             model=model,
             messages=messages,
             parameters=parameters,
-            call_fn=make_call,
+            call_fn=partial(self._invoke_chat, model, messages, parameters),
         )
         
         return response, trace
@@ -129,21 +129,12 @@ class OpenAIAdapter:
             **kwargs,
         }
         
-        def make_call():
-            return self.client.completions.create(
-                model=model,
-                prompt=prompt,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
-            )
-        
         response, trace = self.capture_layer.capture(
             provider="openai",
             model=model,
             messages=messages,
             parameters=parameters,
-            call_fn=make_call,
+            call_fn=partial(self._invoke_completion, model, prompt, parameters),
         )
         
         return response, trace
@@ -0,0 +1,92 @@
+"""
+Response Cache - Exact-Match Reuse of LLM Responses
+
+Purpose: Skip repeated LLM calls for identical requests.
+
+Design rules:
+- Opt-in: CaptureLayer(cache=ResponseCache())
+- Exact match only (provider, model, messages, parameters, call kwargs) —
+  deterministic, no similarity judgments
+- Hits are still traced, marked with metadata {"cache": "hit"}
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+# Returned by get() on a miss (None is a valid cached response)
+MISS = object()
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of raw LLM responses.
+    
+    Usage:
+        layer = CaptureLayer(cache=ResponseCache(maxsize=512))
+        adapter = OpenAIAdapter(capture_layer=layer)
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Most responses kept; the least recently used is evicted
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(
+        provider: str,
+        model: str,
+        messages: list[dict[str, str]],
+        parameters: Optional[dict[str, Any]] = None,
+        kwargs: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build the cache key for a request.
+        
+        kwargs are the extra arguments forwarded to call_fn (tools,
+        response_format, ...); they change the response, so they are keyed.
+        """
+        canonical = json.dumps(
+            [provider, model, messages, parameters or {}, kwargs or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    def get(self, key: str) -> Any:
+        """Return the cached response for key, or MISS."""
+        with self._lock:
+            value = self._entries.get(key, MISS)
+            if value is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a response, evicting the least recently used if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -11,18 +11,31 @@ Responsibilities:
 - Emit a trace record
 """
 
+import asyncio
+import atexit
+import functools
+import importlib.metadata
+import inspect
+import queue
+import sys
+import threading
 import time
-from datetime import datetime
+from contextvars import ContextVar
 from typing import Any, Callable, Optional
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
+from sdk.cache import MISS, ResponseCache
 from sdk.schema import (
     Trace,
     TraceRequest,
     TraceResponse,
     TraceRuntime,
-    TraceMessage,
-    TraceParameters,
+)
+
+
+# Traces held by batch() in the current context, per layer (None outside one)
+_batch: ContextVar[Optional[dict["CaptureLayer", list[Trace]]]] = ContextVar(
+    "phylax_batch", default=None
 )
 
 
@@ -38,17 +51,40 @@ class CaptureLayer:
         self,
         storage_path: Optional[str] = None,
         auto_store: bool = True,
+        background: bool = False,
+        max_batch: int = 32,
+        flush_interval_ms: int = 100,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
     ):
         """
         Initialize the capture layer.
         
         Args:
-            storage_path: Path to store traces. Defaults to ~/.sentinel/traces
+            storage_path: Base storage directory (traces go under traces/). Defaults to ~/.Phylax
             auto_store: Whether to automatically store traces after capture
+            background: Hand stored traces to a writer thread instead of
+                writing them in the calling thread. Traces become visible in
+                storage shortly after capture; flush() waits for them.
+            max_batch: Most traces the writer thread saves in one go
+            flush_interval_ms: Longest the writer thread waits to fill a batch
+            cache: Optional ResponseCache; identical requests reuse the cached
+                response instead of calling call_fn
+            coalesce: In acapture(), let identical requests that arrive while
+                one is in flight await its response instead of calling again
         """
         self.storage_path = storage_path
         self.auto_store = auto_store
+        self.background = background
+        self.max_batch = max_batch
+        self.flush_interval_ms = flush_interval_ms
+        self.cache = cache
+        self.coalesce = coalesce
+        self._inflight: dict[tuple, asyncio.Future] = {}
         self._pending_traces: list[Trace] = []
+        self._storage = None
+        self._write_q: Optional[queue.Queue] = None
+        self._writer_lock = threading.Lock()
     
     def capture(
         self,
@@ -73,51 +109,99 @@ class CaptureLayer:
         Returns:
             Tuple of (response, trace)
         """
-        # Build request
-        trace_messages = [TraceMessage(**msg) for msg in messages]
-        trace_params = TraceParameters(**(parameters or {}))
+        request = self._build_request(provider, model, messages, parameters)
         
-        request = TraceRequest(
-            provider=provider,
-            model=model,
-            messages=trace_messages,
-            parameters=trace_params,
+        # Serve identical requests from the cache, if one is configured
+        cache_key, response_data = self._cache_lookup(
+            provider, model, messages, parameters, call_fn, kwargs,
         )
+        if response_data is not MISS:
+            trace = self._build_trace(provider, request, response_data, 0, cache="hit")
+        else:
+            # Execute the call and measure latency
+            start_time = time.perf_counter()
+            
+            if call_fn is not None:
+                response_data = call_fn(**kwargs)
+            else:
+                response_data = {"text": "", "usage": None}
+            
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, response_data)
+            trace = self._build_trace(provider, request, response_data, latency_ms)
         
-        # Execute the call and measure latency
-        start_time = time.perf_counter()
-        
-        if call_fn is not None:
-            response_data = call_fn(**kwargs)
+        # Store if auto_store is enabled
+        if self.auto_store:
+            self._store_trace(trace)
         else:
-            response_data = {"text": "", "usage": None}
+            self._pending_traces.append(trace)
         
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
+        return response_data, trace
+    
+    async def acapture(
+        self,
+        provider: str,
+        model: str,
+        messages: list[dict[str, str]],
+        parameters: Optional[dict[str, Any]] = None,
+        call_fn: Optional[Callable] = None,
+        **kwargs,
+    ) -> tuple[Any, Trace]:
+        """
+        Async twin of capture().
         
-        # Build response
-        response_text = self._extract_response_text(response_data)
-        response = TraceResponse(
-            text=response_text,
-            latency_ms=latency_ms,
-            usage=self._extract_usage(response_data),
-        )
+        call_fn may be a coroutine function (e.g. an async OpenAI client
+        method), so concurrent calls overlap on the event loop. A plain
+        callable is also accepted but blocks the loop while it runs.
+        Storing the trace runs in a worker thread.
         
-        # Build runtime info
-        runtime = TraceRuntime(
-            library=self._detect_library(provider),
-            version=self._get_library_version(provider),
-        )
+        Args:
+            provider: The LLM provider (openai, local, custom)
+            model: The model name
+            messages: List of message dicts with 'role' and 'content'
+            parameters: Optional parameters (temperature, max_tokens, etc.)
+            call_fn: The function to execute for the actual LLM call
+            **kwargs: Additional arguments passed to call_fn
+            
+        Returns:
+            Tuple of (response, trace)
+        """
+        request = self._build_request(provider, model, messages, parameters)
         
-        # Create trace
-        trace = Trace(
-            request=request,
-            response=response,
-            runtime=runtime,
+        # Serve identical requests from the cache, if one is configured
+        cache_key, response_data = self._cache_lookup(
+            provider, model, messages, parameters, call_fn, kwargs,
         )
+        if response_data is not MISS:
+            trace = self._build_trace(provider, request, response_data, 0, cache="hit")
+        else:
+            # Execute (or join an identical in-flight call) and measure latency
+            start_time = time.perf_counter()
+            coalesced = False
+            
+            if call_fn is None:
+                response_data = {"text": "", "usage": None}
+            elif self.coalesce:
+                response_data, coalesced = await self._acall_coalesced(
+                    provider, model, messages, parameters, call_fn, kwargs,
+                )
+            else:
+                response_data = await _acall(call_fn, kwargs)
+            
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, response_data)
+            trace = self._build_trace(
+                provider, request, response_data, latency_ms,
+                cache="coalesced" if coalesced else None,
+            )
         
         # Store if auto_store is enabled
         if self.auto_store:
-            self._store_trace(trace)
+            await asyncio.to_thread(self._store_trace, trace)
         else:
             self._pending_traces.append(trace)
         
@@ -144,17 +228,181 @@ class CaptureLayer:
             if ctx.trace is not None and self.auto_store:
                 self._store_trace(ctx.trace)
     
+    @asynccontextmanager
+    async def acontext(
+        self,
+        provider: str,
+        model: str,
+    ):
+        """
+        Async twin of context(); the trace is stored in a worker thread.
+        
+        Usage:
+            async with capture_layer.acontext("openai", "gpt-4") as ctx:
+                response = await client.chat.completions.create(...)
+                ctx.record(messages, response)
+        """
+        ctx = CaptureContext(self, provider, model)
+        try:
+            yield ctx
+        finally:
+            if ctx.trace is not None and self.auto_store:
+                await asyncio.to_thread(self._store_trace, ctx.trace)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Hold traces stored in the block and save them together on exit.
+        
+        Covers every trace this layer stores from the current context:
+        capture()/acapture(), context()/acontext(), and @trace calls that
+        use this layer (get_capture_layer() unless one was passed). The
+        buffer is a ContextVar, so calls on other threads are not held,
+        while tasks and asyncio.to_thread calls started inside the block
+        are. Nested batches on the same layer join the outermost one.
+        
+        Usage:
+            with capture_layer.batch():
+                for prompt in prompts:
+                    adapter.generate(prompt)
+        """
+        held = _batch.get() or {}
+        if self in held:
+            yield self
+            return
+        
+        traces: list[Trace] = []
+        token = _batch.set({**held, self: traces})
+        try:
+            yield self
+        finally:
+            _batch.reset(token)
+            if traces:
+                self._get_storage().save_traces(traces)
+    
+    def _build_request(
+        self,
+        provider: str,
+        model: str,
+        messages: list[dict[str, str]],
+        parameters: Optional[dict[str, Any]],
+    ) -> TraceRequest:
+        """Build the request portion of a trace."""
+        # Raw dicts: the request's validator builds the nested models
+        return TraceRequest(
+            provider=provider,
+            model=model,
+            messages=messages,
+            parameters=parameters or {},
+        )
+    
+    async def _acall_coalesced(
+        self,
+        provider: str,
+        model: str,
+        messages: list[dict[str, str]],
+        parameters: Optional[dict[str, Any]],
+        call_fn: Callable,
+        kwargs: dict[str, Any],
+    ) -> tuple[Any, bool]:
+        """
+        Run call_fn, or await the identical call already in flight.
+        
+        Returns:
+            (response, True if it came from another in-flight call)
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, ResponseCache.key(provider, model, messages, parameters, kwargs))
+        
+        leader = self._inflight.get(key)
+        if leader is not None:
+            # shield: a cancelled follower must not cancel the leader's call
+            return await asyncio.shield(leader), True
+        
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            response_data = await _acall(call_fn, kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # followers re-raise it; no "never retrieved" warning
+            raise
+        else:
+            future.set_result(response_data)
+            return response_data, False
+        finally:
+            del self._inflight[key]
+    
+    def _cache_lookup(
+        self,
+        provider: str,
+        model: str,
+        messages: list[dict[str, str]],
+        parameters: Optional[dict[str, Any]],
+        call_fn: Optional[Callable],
+        kwargs: dict[str, Any],
+    ) -> tuple[Optional[str], Any]:
+        """
+        Look a request up in the response cache.
+        
+        Returns:
+            (key, cached response or MISS); key is None when not caching
+        """
+        if self.cache is None or call_fn is None:
+            return None, MISS
+        key = self.cache.key(provider, model, messages, parameters, kwargs)
+        return key, self.cache.get(key)
+    
+    def _build_trace(
+        self,
+        provider: str,
+        request: TraceRequest,
+        response_data: Any,
+        latency_ms: int,
+        cache: Optional[str] = None,
+    ) -> Trace:
+        """
+        Build a trace from the request and the call's response.
+        
+        cache marks responses that were not fetched by this call ("hit" from
+        the response cache, "coalesced" from an identical in-flight call).
+        """
+        response = TraceResponse(
+            text=self._extract_response_text(response_data),
+            latency_ms=latency_ms,
+            usage=self._extract_usage(response_data),
+        )
+        runtime = TraceRuntime(
+            library=_detect_library(provider),
+            version=_get_library_version(provider),
+        )
+        return Trace(
+            request=request,
+            response=response,
+            runtime=runtime,
+            metadata={"cache": cache} if cache else None,
+        )
+    
     def _extract_response_text(self, response_data: Any) -> str:
         """Extract text from various response formats."""
         if isinstance(response_data, dict):
-            return response_data.get("text", str(response_data))
+            # Only stringify the whole dict when there is no "text" key
+            if "text" in response_data:
+                return response_data["text"]
+            return str(response_data)
         if isinstance(response_data, str):
             return response_data
-        # Handle OpenAI response objects
-        if hasattr(response_data, "choices") and response_data.choices:
-            choice = response_data.choices[0]
-            if hasattr(choice, "message"):
+        # Handle OpenAI response objects (chat completions first)
+        choices = getattr(response_data, "choices", None)
+        if choices:
+            choice = choices[0]
+            try:
                 return choice.message.content or ""
+            except AttributeError:
+                pass
             if hasattr(choice, "text"):
                 return choice.text or ""
         return str(response_data)
@@ -163,60 +411,148 @@ class CaptureLayer:
         """Extract token usage from response."""
         if isinstance(response_data, dict):
             return response_data.get("usage")
-        if hasattr(response_data, "usage") and response_data.usage:
+        usage = getattr(response_data, "usage", None)
+        if usage:
             return {
-                "prompt_tokens": response_data.usage.prompt_tokens,
-                "completion_tokens": response_data.usage.completion_tokens,
-                "total_tokens": response_data.usage.total_tokens,
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens,
             }
         return None
     
-    def _detect_library(self, provider: str) -> str:
-        """Detect the library based on provider."""
-        mapping = {
-            "openai": "openai",
-            "local": "llama_cpp",
-            "llama": "llama_cpp",
-            "transformers": "transformers",
-        }
-        return mapping.get(provider.lower(), provider)
-    
-    def _get_library_version(self, provider: str) -> str:
-        """Get the version of the library."""
-        try:
-            if provider.lower() == "openai":
-                import openai
-                return openai.__version__
-            elif provider.lower() in ("local", "llama"):
-                try:
-                    import llama_cpp
-                    return llama_cpp.__version__
-                except ImportError:
-                    return "unknown"
-        except Exception:
-            pass
-        return "unknown"
+    def _get_storage(self):
+        """Get or create the storage backend (created once per layer)."""
+        if self._storage is None:
+            # Import here to avoid circular dependency
+            from server.storage.files import FileStorage
+            
+            self._storage = FileStorage(base_path=self.storage_path)
+        return self._storage
     
     def _store_trace(self, trace: Trace) -> None:
         """Store a trace to the configured storage."""
-        # Import here to avoid circular dependency
-        from server.storage.files import FileStorage
-        
-        storage = FileStorage(base_path=self.storage_path)
-        storage.save_trace(trace)
+        held = _batch.get()
+        batch = held.get(self) if held else None
+        if batch is not None:
+            batch.append(trace)
+        elif self.background:
+            self._get_write_queue().put(trace)
+        else:
+            self._get_storage().save_trace(trace)
+    
+    def _get_write_queue(self) -> queue.Queue:
+        """Get the writer thread's queue, starting the thread on first use."""
+        if self._write_q is None:
+            with self._writer_lock:
+                if self._write_q is None:
+                    # Resolve storage here so a failing backend raises to the
+                    # caller instead of killing the writer with traces queued
+                    storage = self._get_storage()
+                    write_q: queue.Queue = queue.Queue()
+                    threading.Thread(
+                        target=self._writer_loop,
+                        args=(write_q, storage),
+                        name="phylax-trace-writer",
+                        daemon=True,
+                    ).start()
+                    # Daemon threads die with the interpreter; drain first
+                    atexit.register(write_q.join)
+                    self._write_q = write_q
+        return self._write_q
+    
+    def _writer_loop(self, write_q: queue.Queue, storage) -> None:
+        """Save queued traces in batches of up to max_batch traces."""
+        while True:
+            batch = [write_q.get()]
+            deadline = time.monotonic() + self.flush_interval_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(write_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                storage.save_traces(batch)
+            except Exception as e:
+                print(f"Phylax: failed to store {len(batch)} trace(s): {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    write_q.task_done()
     
     def flush(self) -> list[Trace]:
-        """Flush and return all pending traces."""
-        traces = self._pending_traces.copy()
-        for trace in traces:
-            self._store_trace(trace)
-        self._pending_traces.clear()
+        """
+        Flush and return all pending traces.
+        
+        With background=True, also waits until the writer thread has
+        saved every trace handed to it.
+        """
+        # Swap in a fresh list: no copy, and traces recorded while these
+        # are saved stay pending instead of being cleared unsaved
+        traces, self._pending_traces = self._pending_traces, []
+        if traces:
+            self._get_storage().save_traces(traces)
+        if self._write_q is not None:
+            self._write_q.join()
         return traces
 
 
+# Distribution that provides each provider's library, for version lookup
+_LIBRARY_DISTRIBUTIONS = {
+    "openai": "openai",
+    "local": "llama-cpp-python",
+    "llama": "llama-cpp-python",
+    "transformers": "transformers",
+}
+
+
+# Both are pure functions of the provider; cached so each trace does a
+# single dict lookup
+@functools.lru_cache(maxsize=16)
+def _detect_library(provider: str) -> str:
+    """Detect the library based on provider."""
+    mapping = {
+        "openai": "openai",
+        "local": "llama_cpp",
+        "llama": "llama_cpp",
+        "transformers": "transformers",
+    }
+    return mapping.get(provider.lower(), provider)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_library_version(provider: str) -> str:
+    """
+    Get the version of the library.
+    
+    Read from the installed package metadata, so the library itself is
+    never imported just to report its version.
+    """
+    distribution = _LIBRARY_DISTRIBUTIONS.get(provider.lower())
+    if distribution is None:
+        return "unknown"
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+async def _acall(call_fn: Callable, kwargs: dict[str, Any]) -> Any:
+    """Call call_fn, awaiting the result if it is awaitable."""
+    response_data = call_fn(**kwargs)
+    if inspect.isawaitable(response_data):
+        response_data = await response_data
+    return response_data
+
+
 class CaptureContext:
     """Context for manual trace recording."""
     
+    # One per context() block; slots skip the per-instance __dict__
+    __slots__ = ("capture_layer", "provider", "model", "trace", "_start_time")
+    
     def __init__(self, capture_layer: CaptureLayer, provider: str, model: str):
         self.capture_layer = capture_layer
         self.provider = provider
@@ -233,14 +569,12 @@ class CaptureContext:
         """Record the captured call."""
         latency_ms = int((time.perf_counter() - self._start_time) * 1000)
         
-        trace_messages = [TraceMessage(**msg) for msg in messages]
-        trace_params = TraceParameters(**(parameters or {}))
-        
+        # Raw dicts: the request's validator builds the nested models
         request = TraceRequest(
             provider=self.provider,
             model=self.model,
-            messages=trace_messages,
-            parameters=trace_params,
+            messages=messages,
+            parameters=parameters or {},
         )
         
         response_text = self.capture_layer._extract_response_text(response)
@@ -251,8 +585,8 @@ class CaptureContext:
         )
         
         runtime = TraceRuntime(
-            library=self.capture_layer._detect_library(self.provider),
-            version=self.capture_layer._get_library_version(self.provider),
+            library=_detect_library(self.provider),
+            version=_get_library_version(self.provider),
         )
         
         self.trace = Trace(
@@ -9,7 +9,7 @@ Design principles:
 - Optional usage - existing code works unchanged
 """
 
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
 from uuid import uuid4
 from contextlib import contextmanager
 from typing import Optional, Generator
@@ -18,7 +18,8 @@ from typing import Optional, Generator
 # Context variables for execution tracking
 _execution_id: ContextVar[str] = ContextVar('phylax_execution_id')
 _current_node_id: ContextVar[str] = ContextVar('phylax_current_node_id')
-_node_stack: ContextVar[list] = ContextVar('phylax_node_stack', default=[])
+# Immutable, rebound on every push/pop, so copied contexts never share it
+_node_stack: ContextVar[tuple[str, ...]] = ContextVar('phylax_node_stack', default=())
 
 
 @contextmanager
@@ -41,7 +42,7 @@ def execution() -> Generator[str, None, None]:
     """
     exec_id = str(uuid4())
     token = _execution_id.set(exec_id)
-    stack_token = _node_stack.set([])
+    stack_token = _node_stack.set(())
     
     try:
         yield exec_id
@@ -71,35 +72,35 @@ def get_parent_node_id() -> Optional[str]:
     - No execution context exists
     - This is the first call in the context
     """
-    try:
-        stack = _node_stack.get()
-        return stack[-1] if stack else None
-    except LookupError:
-        return None
+    stack = _node_stack.get()
+    return stack[-1] if stack else None
 
 
-def push_node(node_id: str) -> None:
+def push_node(node_id: str) -> Token:
     """
     Push a node onto the stack (called when entering a traced function).
+    
+    Returns:
+        Token to hand to pop_node()
     """
-    try:
-        stack = _node_stack.get()
-        stack.append(node_id)
-    except LookupError:
-        # No context, no tracking needed
-        pass
+    return _node_stack.set(_node_stack.get() + (node_id,))
 
 
-def pop_node() -> None:
+def pop_node(token: Optional[Token] = None) -> None:
     """
     Pop a node from the stack (called when exiting a traced function).
+    
+    Args:
+        token: The token push_node() returned; restores the stack exactly.
+            Without it, the top node is dropped.
     """
-    try:
-        stack = _node_stack.get()
-        if stack:
-            stack.pop()
-    except LookupError:
-        pass
+    if token is not None:
+        _node_stack.reset(token)
+        return
+    
+    stack = _node_stack.get()
+    if stack:
+        _node_stack.set(stack[:-1])
 
 
 def in_execution_context() -> bool:
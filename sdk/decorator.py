@@ -9,17 +9,32 @@ Decorators:
 - @expect: Define expectations for validation
 """
 
+import asyncio
 import functools
+import inspect
+import time
+import weakref
 from typing import Any, Callable, Optional, TypeVar, ParamSpec
+from uuid import uuid4
 
-from sdk.capture import get_capture_layer, CaptureLayer
+from sdk.capture import (
+    get_capture_layer,
+    CaptureLayer,
+    _detect_library,
+    _get_library_version,
+)
 from sdk.context import get_execution_id, get_parent_node_id, push_node, pop_node
+from sdk.schema import Trace, TraceRequest, TraceResponse, TraceRuntime
 
 P = ParamSpec("P")
 T = TypeVar("T")
 
-# Store expectations per function (set by @expect decorator)
-_function_expectations: dict[Callable, dict[str, Any]] = {}
+# Expectations per function (set by @expect decorator). The traced call
+# reads them from the function's __phylax_expect__ attribute; this weak
+# mirror is for inspection and does not keep functions alive.
+_function_expectations: "weakref.WeakKeyDictionary[Callable, dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def expect(
@@ -49,12 +64,21 @@ def expect(
         Decorated function with attached expectations
     """
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
-        # Store expectations for this function
-        _function_expectations[func] = {
+        from sdk.expectations import build_evaluator
+        
+        # Store expectations for this function, with the rules built once
+        # here rather than on every traced call
+        func.__phylax_expect__ = _function_expectations[func] = {
             "must_include": must_include,
             "must_not_include": must_not_include,
             "max_latency_ms": max_latency_ms,
             "min_tokens": min_tokens,
+            "_evaluator": build_evaluator(
+                must_include=must_include,
+                must_not_include=must_not_include,
+                max_latency_ms=max_latency_ms,
+                min_tokens=min_tokens,
+            ),
         }
         return func
     return decorator
@@ -85,6 +109,47 @@ def trace(
         Decorated function that traces calls
     """
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                layer = capture_layer or get_capture_layer()
+                
+                # Phase 13: Get execution context
+                execution_id = get_execution_id()
+                parent_node_id = get_parent_node_id()
+                
+                # Try to extract messages from args/kwargs
+                messages = _extract_messages(args, kwargs)
+                parameters = _extract_parameters(kwargs)
+                
+                # Await the function
+                start_time = time.perf_counter()
+                result = await func(*args, **kwargs)
+                latency_ms = int((time.perf_counter() - start_time) * 1000)
+                
+                trace = _create_trace(
+                    layer=layer,
+                    provider=provider,
+                    model=model or _extract_model(kwargs, result),
+                    messages=messages,
+                    parameters=parameters,
+                    result=result,
+                    latency_ms=latency_ms,
+                    expectations=getattr(func, "__phylax_expect__", None),
+                    execution_id=execution_id,
+                    parent_node_id=parent_node_id,
+                )
+                # Store off the event loop
+                await asyncio.to_thread(layer._store_trace, trace)
+                
+                # Phase 13: Push this node for child tracking, then pop after
+                token = push_node(trace.node_id)
+                pop_node(token)
+                
+                return result
+            
+            return async_wrapper
+        
         @functools.wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
             layer = capture_layer or get_capture_layer()
@@ -98,7 +163,6 @@ def trace(
             parameters = _extract_parameters(kwargs)
             
             # Execute the function
-            import time
             start_time = time.perf_counter()
             result = func(*args, **kwargs)
             latency_ms = int((time.perf_counter() - start_time) * 1000)
@@ -107,10 +171,10 @@ def trace(
             actual_model = model or _extract_model(kwargs, result)
             
             # Get expectations if any
-            expectations = _function_expectations.get(func)
+            expectations = getattr(func, "__phylax_expect__", None)
             
-            # Create and store the trace (with verdict if expectations exist)
-            node_id = _create_trace(
+            # Create the trace (with verdict if expectations exist)
+            trace = _create_trace(
                 layer=layer,
                 provider=provider,
                 model=actual_model,
@@ -122,10 +186,11 @@ def trace(
                 execution_id=execution_id,
                 parent_node_id=parent_node_id,
             )
+            layer._store_trace(trace)
             
             # Phase 13: Push this node for child tracking, then pop after
-            push_node(node_id)
-            pop_node()
+            token = push_node(trace.node_id)
+            pop_node(token)
             
             return result
         
@@ -148,17 +213,20 @@ def _extract_messages(args: tuple, kwargs: dict) -> list[dict[str, str]]:
     return []
 
 
+# LLM parameters recorded from a traced function's kwargs
+_PARAM_KEYS = (
+    "temperature",
+    "max_tokens",
+    "top_p",
+    "frequency_penalty",
+    "presence_penalty",
+    "stop",
+)
+
+
 def _extract_parameters(kwargs: dict) -> dict[str, Any]:
     """Extract LLM parameters from kwargs."""
-    param_keys = [
-        "temperature",
-        "max_tokens",
-        "top_p",
-        "frequency_penalty",
-        "presence_penalty",
-        "stop",
-    ]
-    return {k: kwargs[k] for k in param_keys if k in kwargs}
+    return {k: kwargs[k] for k in _PARAM_KEYS if k in kwargs}
 
 
 def _extract_model(kwargs: dict, result: Any) -> str:
@@ -183,27 +251,14 @@ def _create_trace(
     expectations: Optional[dict[str, Any]] = None,
     execution_id: Optional[str] = None,
     parent_node_id: Optional[str] = None,
-) -> str:
-    """Create and store a trace from the captured data. Returns node_id."""
-    from sdk.schema import (
-        Trace,
-        TraceRequest,
-        TraceResponse,
-        TraceRuntime,
-        TraceMessage,
-        TraceParameters,
-        Verdict,
-    )
-    
-    # Build request
-    trace_messages = [TraceMessage(**msg) for msg in messages] if messages else []
-    trace_params = TraceParameters(**parameters) if parameters else TraceParameters()
-    
+) -> Trace:
+    """Create a trace from the captured data; the caller stores it."""
+    # Build request (raw dicts: the request's validator builds the nested models)
     request = TraceRequest(
         provider=provider,
         model=model,
-        messages=trace_messages,
-        parameters=trace_params,
+        messages=messages or [],
+        parameters=parameters or {},
     )
     
     # Build response
@@ -216,13 +271,15 @@ def _create_trace(
     
     # Build runtime
     runtime = TraceRuntime(
-        library=layer._detect_library(provider),
-        version=layer._get_library_version(provider),
+        library=_detect_library(provider),
+        version=_get_library_version(provider),
     )
     
     # Evaluate expectations and create verdict (computed at trace creation time)
     verdict = None
-    if expectations:
+    if expectations and "_evaluator" in expectations:
+        verdict = expectations["_evaluator"].evaluate(response_text, latency_ms)
+    elif expectations:
         from sdk.expectations import evaluate
         verdict = evaluate(
             response_text=response_text,
@@ -234,7 +291,6 @@ def _create_trace(
         )
     
     # Create and store trace with execution context
-    from uuid import uuid4
     node_id = str(uuid4())
     
     trace = Trace(
@@ -247,6 +303,5 @@ def _create_trace(
         parent_node_id=parent_node_id,
     )
     
-    layer._store_trace(trace)
-    return node_id
+    return trace
 
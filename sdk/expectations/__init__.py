@@ -25,6 +25,7 @@ from sdk.expectations.rules import (
 )
 from sdk.expectations.evaluator import (
     Evaluator,
+    build_evaluator,
     evaluate,
 )
 from sdk.schema import Verdict
@@ -39,5 +40,6 @@ __all__ = [
     # Evaluation
     "Verdict",
     "Evaluator",
+    "build_evaluator",
     "evaluate",
 ]
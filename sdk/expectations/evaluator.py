@@ -15,7 +15,6 @@ from typing import Optional
 from sdk.schema import Verdict, SeverityLevel
 from sdk.expectations.rules import (
     Rule,
-    RuleResult,
     MustIncludeRule,
     MustNotIncludeRule,
     MaxLatencyRule,
@@ -23,6 +22,12 @@ from sdk.expectations.rules import (
 )
 
 
+_SEVERITY_ORDER = {"low": 0, "medium": 1, "high": 2}
+
+# Rules that accept a pre-lowered response (see Evaluator.evaluate)
+_SUBSTRING_RULES = (MustIncludeRule, MustNotIncludeRule)
+
+
 class Evaluator:
     """
     Evaluates rules against LLM responses.
@@ -68,26 +73,27 @@ class Evaluator:
         if not self.rules:
             return Verdict(status="pass")
         
-        results: list[RuleResult] = []
+        # Collect violations and the max severity in one pass
+        violations: list[str] = []
+        max_severity: SeverityLevel = "low"
+        text_lower: Optional[str] = None
         for rule in self.rules:
-            result = rule.evaluate(response_text, latency_ms)
-            results.append(result)
-        
-        # Collect all violations
-        violations = [r.violation_message for r in results if not r.passed]
+            if isinstance(rule, _SUBSTRING_RULES) and not rule.case_sensitive:
+                # Lower the response once for all case-insensitive rules
+                if text_lower is None:
+                    text_lower = response_text.lower()
+                result = rule.evaluate(response_text, latency_ms, text_lower=text_lower)
+            else:
+                result = rule.evaluate(response_text, latency_ms)
+            
+            if not result.passed:
+                violations.append(result.violation_message)
+                if _SEVERITY_ORDER[result.severity] > _SEVERITY_ORDER[max_severity]:
+                    max_severity = result.severity
         
         if not violations:
             return Verdict(status="pass")
         
-        # Determine max severity
-        severity_order = {"low": 0, "medium": 1, "high": 2}
-        max_severity: SeverityLevel = "low"
-        
-        for result in results:
-            if not result.passed:
-                if severity_order[result.severity] > severity_order[max_severity]:
-                    max_severity = result.severity
-        
         return Verdict(
             status="fail",
             severity=max_severity,
@@ -95,27 +101,26 @@ class Evaluator:
         )
 
 
-def evaluate(
-    response_text: str,
-    latency_ms: int,
+def build_evaluator(
     must_include: Optional[list[str]] = None,
     must_not_include: Optional[list[str]] = None,
     max_latency_ms: Optional[int] = None,
     min_tokens: Optional[int] = None,
-) -> Verdict:
+) -> Evaluator:
     """
-    Convenience function to evaluate expectations.
+    Build an Evaluator for the given expectations.
+    
+    Build it once and reuse it to check many responses against the
+    same expectations (as @expect does).
     
     Args:
-        response_text: The LLM response text
-        latency_ms: Response latency in milliseconds
         must_include: Substrings that must appear
         must_not_include: Substrings that must NOT appear
         max_latency_ms: Maximum latency threshold
         min_tokens: Minimum token count
         
     Returns:
-        Verdict with pass/fail status and any violations
+        Evaluator with one rule per given expectation
     """
     evaluator = Evaluator()
     
@@ -131,4 +136,35 @@ def evaluate(
     if min_tokens is not None:
         evaluator.min_tokens(min_tokens)
     
+    return evaluator
+
+
+def evaluate(
+    response_text: str,
+    latency_ms: int,
+    must_include: Optional[list[str]] = None,
+    must_not_include: Optional[list[str]] = None,
+    max_latency_ms: Optional[int] = None,
+    min_tokens: Optional[int] = None,
+) -> Verdict:
+    """
+    Convenience function to evaluate expectations.
+    
+    Args:
+        response_text: The LLM response text
+        latency_ms: Response latency in milliseconds
+        must_include: Substrings that must appear
+        must_not_include: Substrings that must NOT appear
+        max_latency_ms: Maximum latency threshold
+        min_tokens: Minimum token count
+        
+    Returns:
+        Verdict with pass/fail status and any violations
+    """
+    evaluator = build_evaluator(
+        must_include=must_include,
+        must_not_include=must_not_include,
+        max_latency_ms=max_latency_ms,
+        min_tokens=min_tokens,
+    )
     return evaluator.evaluate(response_text, latency_ms)
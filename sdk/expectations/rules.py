@@ -14,7 +14,7 @@ Each rule has an associated severity:
 """
 
 from abc import ABC, abstractmethod
-from typing import Literal
+from typing import Literal, Optional
 
 SeverityLevel = Literal["low", "medium", "high"]
 
@@ -22,6 +22,9 @@ SeverityLevel = Literal["low", "medium", "high"]
 class RuleResult:
     """Result of evaluating a single rule."""
     
+    # One per rule per evaluation; slots skip the per-instance __dict__
+    __slots__ = ("passed", "rule_name", "severity", "violation_message")
+    
     def __init__(
         self,
         passed: bool,
@@ -79,8 +82,20 @@ class MustIncludeRule(Rule):
         self.substrings = substrings
         self.case_sensitive = case_sensitive
     
-    def evaluate(self, response_text: str, latency_ms: int) -> RuleResult:
-        text = response_text if self.case_sensitive else response_text.lower()
+    def evaluate(
+        self,
+        response_text: str,
+        latency_ms: int,
+        text_lower: Optional[str] = None,
+    ) -> RuleResult:
+        """
+        Args:
+            text_lower: response_text.lower(), if the caller already has it
+        """
+        if self.case_sensitive:
+            text = response_text
+        else:
+            text = response_text.lower() if text_lower is None else text_lower
         
         missing = []
         for substring in self.substrings:
@@ -122,8 +137,20 @@ class MustNotIncludeRule(Rule):
         self.substrings = substrings
         self.case_sensitive = case_sensitive
     
-    def evaluate(self, response_text: str, latency_ms: int) -> RuleResult:
-        text = response_text if self.case_sensitive else response_text.lower()
+    def evaluate(
+        self,
+        response_text: str,
+        latency_ms: int,
+        text_lower: Optional[str] = None,
+    ) -> RuleResult:
+        """
+        Args:
+            text_lower: response_text.lower(), if the caller already has it
+        """
+        if self.case_sensitive:
+            text = response_text
+        else:
+            text = response_text.lower() if text_lower is None else text_lower
         
         found = []
         for substring in self.substrings:
@@ -199,7 +226,9 @@ class MinTokensRule(Rule):
     def evaluate(self, response_text: str, latency_ms: int) -> RuleResult:
         # Approximate token count by word count
         # More accurate would be to use actual tokenizer, but that adds dependency
-        word_count = len(response_text.split())
+        # Splitting stops after min_tokens words: enough to decide the rule,
+        # and exact whenever it fails (fewer words than that)
+        word_count = len(response_text.split(maxsplit=max(self.min_tokens - 1, 0)))
         
         if word_count < self.min_tokens:
             return RuleResult(
@@ -9,12 +9,52 @@ Design principles:
 - Edges written at runtime, not inferred later
 """
 
-from typing import Optional, Literal
+import copy
+import hashlib
+import heapq
+import json
+from collections import deque
+from functools import cached_property, lru_cache
+from typing import Iterator, Optional, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
 
 
+class _CachingModel(BaseModel):
+    """
+    Base for frozen models that memoize derived data with cached_property.
+    
+    cached_property stores its values in __dict__, which model_copy() copies
+    along with the fields; a copy made with update=... would otherwise keep
+    results computed from the original. Every copy starts with no cache.
+    """
+    
+    def __copy__(self):
+        return _drop_cached(super().__copy__())
+    
+    def __deepcopy__(self, memo=None):
+        return _drop_cached(super().__deepcopy__(memo))
+
+
+def _drop_cached(model: BaseModel) -> BaseModel:
+    """Remove every cached_property value from a model instance."""
+    for name in _cached_names(type(model)):
+        model.__dict__.pop(name, None)
+    return model
+
+
+@lru_cache(maxsize=None)
+def _cached_names(cls: type) -> tuple[str, ...]:
+    """Names of the cached_property attributes of cls and its bases."""
+    return tuple({
+        name
+        for klass in cls.__mro__
+        for name, attr in vars(klass).items()
+        if isinstance(attr, cached_property)
+    })
+
+
 # =============================================================================
 # Phase 19: Semantic Node Roles
 # =============================================================================
@@ -33,7 +73,7 @@ class NodeRole(str, Enum):
     OUTPUT = "output"         # Final output, response
 
 
-class GraphNode(BaseModel):
+class GraphNode(_CachingModel):
     """
     A node in the execution graph (corresponds to one trace).
     
@@ -57,6 +97,16 @@ class GraphNode(BaseModel):
     
     class Config:
         frozen = True  # Immutable
+    
+    @cached_property
+    def _digest(self) -> bytes:
+        """
+        Phase 25: SHA256 of this node's fields (declaration order).
+        
+        Cached on the node, so graphs that share a node (copies,
+        snapshots) hash it only once.
+        """
+        return hashlib.sha256(self.model_dump_json().encode()).digest()
 
 
 class GraphEdge(BaseModel):
@@ -158,7 +208,7 @@ class GraphDiff(BaseModel):
         frozen = True
 
 
-class ExecutionGraph(BaseModel):
+class ExecutionGraph(_CachingModel):
     """
     Complete execution graph.
     
@@ -216,9 +266,10 @@ class ExecutionGraph(BaseModel):
         root_node_id = None
         total_latency = 0
         
+        total = len(traces)
         for i, trace in enumerate(traces):
             # Phase 19: Infer semantic role and labels
-            role, human_label, description = _infer_semantics(trace, i, len(traces))
+            role, human_label, description = _infer_semantics(trace, i, total)
             
             # Create node with semantic metadata
             node = GraphNode(
@@ -262,66 +313,142 @@ class ExecutionGraph(BaseModel):
             node_count=len(nodes),
         )
     
-    def get_children(self, node_id: str) -> list[str]:
-        """Get all direct children of a node."""
-        return [e.to_node for e in self.edges if e.from_node == node_id]
+    # -------------------------------------------------------------------------
+    # Cached indexes. The graph is frozen, so each is built on first use and
+    # shared by every traversal and analysis method. cached_property values
+    # live outside the model fields: they are not dumped or compared, and
+    # copies start without them (see _CachingModel).
+    # -------------------------------------------------------------------------
+    
+    @cached_property
+    def _children(self) -> dict[str, list[str]]:
+        """Child node IDs per node ID, in edge order."""
+        children: dict[str, list[str]] = {}
+        for e in self.edges:
+            children.setdefault(e.from_node, []).append(e.to_node)
+        return children
     
-    def get_parent(self, node_id: str) -> Optional[str]:
-        """Get parent of a node."""
+    @cached_property
+    def _parents(self) -> dict[str, list[str]]:
+        """Parent node IDs per node ID, in edge order."""
+        parents: dict[str, list[str]] = {}
         for e in self.edges:
-            if e.to_node == node_id:
-                return e.from_node
-        return None
+            parents.setdefault(e.to_node, []).append(e.from_node)
+        return parents
     
-    def get_node(self, node_id: str) -> Optional[GraphNode]:
-        """Get a node by ID."""
-        for n in self.nodes:
-            if n.node_id == node_id:
-                return n
-        return None
+    @cached_property
+    def _nodes_by_id(self) -> dict[str, GraphNode]:
+        """Node lookup; the first node wins if an ID repeats."""
+        return {n.node_id: n for n in reversed(self.nodes)}
     
-    def topological_order(self) -> list[str]:
-        """Return node IDs in topological order (parents before children)."""
-        # Build adjacency list
-        children: dict[str, list[str]] = {n.node_id: [] for n in self.nodes}
+    @cached_property
+    def _topo(self) -> list[str]:
+        """Node IDs in topological order (Kahn's algorithm)."""
         in_degree: dict[str, int] = {n.node_id: 0 for n in self.nodes}
-        
         for e in self.edges:
-            if e.from_node in children:
-                children[e.from_node].append(e.to_node)
             if e.to_node in in_degree:
                 in_degree[e.to_node] += 1
         
-        # Kahn's algorithm
-        queue = [n for n, d in in_degree.items() if d == 0]
+        queue = deque(n for n, d in in_degree.items() if d == 0)
         result = []
         
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             result.append(node)
-            for child in children.get(node, []):
+            for child in self._children.get(node, []):
                 in_degree[child] -= 1
                 if in_degree[child] == 0:
                     queue.append(child)
         
         return result
     
+    def get_children(self, node_id: str) -> list[str]:
+        """Get all direct children of a node."""
+        return list(self._children.get(node_id, []))
+    
+    def get_parent(self, node_id: str) -> Optional[str]:
+        """Get parent of a node."""
+        parents = self._parents.get(node_id)
+        return parents[0] if parents else None
+    
+    def get_node(self, node_id: str) -> Optional[GraphNode]:
+        """Get a node by ID."""
+        return self._nodes_by_id.get(node_id)
+    
+    def topological_order(self) -> list[str]:
+        """Return node IDs in topological order (parents before children)."""
+        return list(self._topo)
+    
+    def with_node_verdict(self, node_id: str, verdict_status: Optional[str]) -> "ExecutionGraph":
+        """
+        Return a copy of this graph with one node's verdict replaced.
+        
+        The graph itself stays read-only. Edges are unchanged, so the copy
+        shares this graph's cached adjacency and topological order; the
+        other caches are rebuilt on demand. The graph verdict and any snapshot
+        integrity hash no longer apply and are cleared.
+        
+        Args:
+            node_id: Node whose verdict changes
+            verdict_status: New status ("pass", "fail" or None)
+            
+        Returns:
+            New ExecutionGraph
+        """
+        if node_id not in self._nodes_by_id:
+            raise ValueError(f"Node {node_id} not in graph")
+        
+        nodes = [
+            n.model_copy(update={"verdict_status": verdict_status}) if n.node_id == node_id else n
+            for n in self.nodes
+        ]
+        failed = {n.node_id for n in nodes if n.verdict_status == "fail"}
+        stages = [
+            st.model_copy(update={"has_failure": any(i in failed for i in st.node_ids)})
+            if node_id in st.node_ids else st
+            for st in self.stages
+        ]
+        
+        graph = self.model_copy(update={
+            "nodes": nodes,
+            "stages": stages,
+            "verdict": None,
+            "integrity_hash": None,
+            "snapshot_at": None,
+        })
+        # The copy starts uncached; carry over the indexes built from edges only
+        for name in ("_children", "_parents", "_topo"):
+            if name in self.__dict__:
+                graph.__dict__[name] = self.__dict__[name]
+        return graph
+    
     def get_failed_nodes(self) -> list[GraphNode]:
         """Get all nodes with failed verdicts."""
         return [n for n in self.nodes if n.verdict_status == "fail"]
     
     def get_tainted_nodes(self, failed_node_id: str) -> list[str]:
         """Get all nodes downstream of a failed node (blast radius)."""
-        tainted = set()
-        queue = [failed_node_id]
+        return list(self._reachable_from([failed_node_id]))
+    
+    def _reachable_from(self, sources) -> set[str]:
+        """
+        All node IDs reachable from any of `sources`, sources included.
+        
+        One BFS for all sources with a shared visited set, so overlapping
+        blast radii are walked once. Nodes are marked when enqueued, which
+        keeps each node out of the queue after its first discovery.
+        """
+        seen = set(sources)
+        queue = deque(seen)
+        children = self._children
         
         while queue:
-            node_id = queue.pop(0)
-            if node_id not in tainted:
-                tainted.add(node_id)
-                queue.extend(self.get_children(node_id))
+            for child in children.get(queue.popleft(), ()):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
         
-        return list(tainted)
+        return seen
     
     def compute_verdict(self) -> GraphVerdict:
         """
@@ -332,8 +459,15 @@ class ExecutionGraph(BaseModel):
         - Root cause = first failing node in topological order
         - Tainted = all nodes downstream of failures
         """
-        failed_nodes = self.get_failed_nodes()
-        
+        return self._verdict
+    
+    @cached_property
+    def _verdict(self) -> GraphVerdict:
+        """Verdict behind compute_verdict() (GraphVerdict is frozen, so shared)."""
+        return self._verdict_from(self.get_failed_nodes())
+    
+    def _verdict_from(self, failed_nodes: list[GraphNode]) -> GraphVerdict:
+        """Build the graph verdict from the already-collected failed nodes."""
         if not failed_nodes:
             return GraphVerdict(
                 status="pass",
@@ -341,19 +475,16 @@ class ExecutionGraph(BaseModel):
             )
         
         # Find root cause: first failure in topological order
-        topo_order = self.topological_order()
         failed_ids = {n.node_id for n in failed_nodes}
         
         root_cause = None
-        for node_id in topo_order:
+        for node_id in self._topo:
             if node_id in failed_ids:
                 root_cause = node_id
                 break
         
         # Calculate blast radius (tainted nodes)
-        all_tainted = set()
-        for node in failed_nodes:
-            all_tainted.update(self.get_tainted_nodes(node.node_id))
+        all_tainted = self._reachable_from(failed_ids)
         
         # Don't count failed nodes as tainted
         tainted_only = all_tainted - failed_ids
@@ -380,40 +511,47 @@ class ExecutionGraph(BaseModel):
         Returns:
             dict with path (node IDs), total_latency, and bottleneck node
         """
+        result = self._critical_path
+        return {**result, "path": list(result["path"])}
+    
+    @cached_property
+    def _critical_path(self) -> dict:
+        """Result behind critical_path(); callers get a copy."""
         if not self.nodes:
             return {"path": [], "total_latency_ms": 0, "bottleneck": None}
         
-        # Build adjacency and latency maps
         latency = {n.node_id: n.latency_ms for n in self.nodes}
-        children: dict[str, list[str]] = {n.node_id: [] for n in self.nodes}
-        parents: dict[str, list[str]] = {n.node_id: [] for n in self.nodes}
-        
-        for e in self.edges:
-            if e.from_node in children:
-                children[e.from_node].append(e.to_node)
-            if e.to_node in parents:
-                parents[e.to_node].append(e.from_node)
         
         # Find all end nodes (no children)
-        end_nodes = [n.node_id for n in self.nodes if not children[n.node_id]]
+        end_nodes = [n.node_id for n in self.nodes if not self._children.get(n.node_id)]
         
-        # Calculate longest path to each node (dynamic programming)
-        longest_to = {n.node_id: (latency[n.node_id], [n.node_id]) for n in self.nodes}
+        return self._critical_path_from(latency, end_nodes)
+    
+    def _critical_path_from(self, latency: dict[str, int], end_nodes: list[str]) -> dict:
+        """Longest-latency path, given per-node latency and the end nodes."""
+        # Calculate longest path to each node (dynamic programming). Only the
+        # best predecessor is kept per node; the path is rebuilt once at the end.
+        longest_to = dict(latency)
+        best_parent: dict[str, str] = {}
         
-        for node_id in self.topological_order():
-            for parent in parents[node_id]:
-                parent_dist, parent_path = longest_to[parent]
-                new_dist = parent_dist + latency[node_id]
-                if new_dist > longest_to[node_id][0]:
-                    longest_to[node_id] = (new_dist, parent_path + [node_id])
+        for node_id in self._topo:
+            for parent in self._parents.get(node_id, []):
+                new_dist = longest_to[parent] + latency[node_id]
+                if new_dist > longest_to[node_id]:
+                    longest_to[node_id] = new_dist
+                    best_parent[node_id] = parent
         
         # Find the end node with longest path
-        best_end = max(end_nodes, key=lambda n: longest_to[n][0]) if end_nodes else None
+        best_end = max(end_nodes, key=longest_to.__getitem__) if end_nodes else None
         
         if not best_end:
             return {"path": [], "total_latency_ms": 0, "bottleneck": None}
         
-        path_dist, path = longest_to[best_end]
+        path_dist = longest_to[best_end]
+        path = [best_end]
+        while path[-1] in best_parent:
+            path.append(best_parent[path[-1]])
+        path.reverse()
         
         # Find bottleneck (slowest node on critical path)
         bottleneck = max(path, key=lambda n: latency.get(n, 0))
@@ -438,7 +576,8 @@ class ExecutionGraph(BaseModel):
         if not self.nodes or self.total_latency_ms == 0:
             return []
         
-        sorted_nodes = sorted(self.nodes, key=lambda n: n.latency_ms, reverse=True)
+        # Partial selection; same order (ties included) as a full sort
+        slowest = heapq.nlargest(top_n, self.nodes, key=lambda n: n.latency_ms)
         
         return [
             {
@@ -447,9 +586,26 @@ class ExecutionGraph(BaseModel):
                 "latency_ms": n.latency_ms,
                 "percent_of_total": round(n.latency_ms / self.total_latency_ms * 100, 1),
             }
-            for n in sorted_nodes[:top_n]
+            for n in slowest
         ]
     
+    def analyze(self, top_n: int = 3) -> dict:
+        """
+        Compute verdict, critical path and bottlenecks together.
+        
+        Equivalent to calling compute_verdict(), critical_path() and
+        find_bottlenecks(top_n); the verdict and critical path come from
+        the same per-graph caches, so repeated analysis is cheap.
+        
+        Returns:
+            dict with verdict (GraphVerdict), critical_path and bottlenecks
+        """
+        return {
+            "verdict": self._verdict,
+            "critical_path": self.critical_path(),
+            "bottlenecks": self.find_bottlenecks(top_n),
+        }
+    
     def diff_with(self, other: "ExecutionGraph") -> "GraphDiff":
         """
         Phase 23: Compare this graph with another graph.
@@ -465,40 +621,30 @@ class ExecutionGraph(BaseModel):
         self_nodes = {n.human_label or n.label: n for n in self.nodes}
         other_nodes = {n.human_label or n.label: n for n in other.nodes}
         
-        self_labels = set(self_nodes.keys())
-        other_labels = set(other_nodes.keys())
-        
         added = []
         removed = []
         changed = []
         
-        # Nodes only in 'other' (added)
-        for label in other_labels - self_labels:
-            node = other_nodes[label]
-            added.append(NodeDiff(
-                node_label=label,
-                change_type="added",
-                latency_delta_ms=node.latency_ms,
-                new_verdict=node.verdict_status,
-            ))
-        
-        # Nodes only in 'self' (removed)
-        for label in self_labels - other_labels:
-            node = self_nodes[label]
-            removed.append(NodeDiff(
-                node_label=label,
-                change_type="removed",
-                latency_delta_ms=-node.latency_ms,
-                old_verdict=node.verdict_status,
-            ))
-        
-        # Nodes in both (check for changes)
-        for label in self_labels & other_labels:
-            self_node = self_nodes[label]
-            other_node = other_nodes[label]
+        # One pass per side over the label maps; lists follow node order
+        for label, node in other_nodes.items():
+            self_node = self_nodes.get(label)
             
-            latency_delta = other_node.latency_ms - self_node.latency_ms
-            verdict_changed = self_node.verdict_status != other_node.verdict_status
+            # Node only in 'other' (added)
+            if self_node is None:
+                added.append(NodeDiff(
+                    node_label=label,
+                    change_type="added",
+                    latency_delta_ms=node.latency_ms,
+                    new_verdict=node.verdict_status,
+                ))
+                continue
+            
+            # Node in both (check for changes); copies of a graph share
+            # their unchanged node objects, which cannot differ
+            if node is self_node:
+                continue
+            latency_delta = node.latency_ms - self_node.latency_ms
+            verdict_changed = self_node.verdict_status != node.verdict_status
             
             if abs(latency_delta) > 50 or verdict_changed:  # 50ms threshold
                 changed.append(NodeDiff(
@@ -507,16 +653,28 @@ class ExecutionGraph(BaseModel):
                     latency_delta_ms=latency_delta,
                     verdict_changed=verdict_changed,
                     old_verdict=self_node.verdict_status,
-                    new_verdict=other_node.verdict_status,
+                    new_verdict=node.verdict_status,
+                ))
+        
+        # Nodes only in 'self' (removed)
+        for label, node in self_nodes.items():
+            if label not in other_nodes:
+                removed.append(NodeDiff(
+                    node_label=label,
+                    change_type="removed",
+                    latency_delta_ms=-node.latency_ms,
+                    old_verdict=node.verdict_status,
                 ))
         
         # Summary stats
         total_changes = len(added) + len(removed) + len(changed)
         latency_delta = other.total_latency_ms - self.total_latency_ms
         
-        self_verdict = self.compute_verdict().status
-        other_verdict = other.compute_verdict().status
-        verdict_changed = self_verdict != other_verdict
+        # A graph fails iff any node fails; the status alone needs no
+        # root-cause or blast-radius traversal
+        self_failed = any(n.verdict_status == "fail" for n in self.nodes)
+        other_failed = any(n.verdict_status == "fail" for n in other.nodes)
+        verdict_changed = self_failed != other_failed
         
         return GraphDiff(
             execution_a=self.execution_id,
@@ -543,6 +701,13 @@ class ExecutionGraph(BaseModel):
         Returns:
             List of investigation steps with node info and reasoning
         """
+        # The graph is frozen, so the steps are computed once; callers get
+        # their own copy of the cached list
+        return copy.deepcopy(self._investigation_steps)
+    
+    @cached_property
+    def _investigation_steps(self) -> list[dict]:
+        """Steps behind investigation_path()."""
         steps = []
         verdict = self.compute_verdict()
         
@@ -584,9 +749,8 @@ class ExecutionGraph(BaseModel):
                     })
         
         # Step 3: Find any validation nodes
-        validation_nodes = [n for n in self.nodes if (n.role.value if hasattr(n.role, 'value') else str(n.role)) == "validation"]
-        if validation_nodes:
-            vn = validation_nodes[0]
+        vn = next((n for n in self.nodes if n.role == NodeRole.VALIDATION), None)
+        if vn:
             steps.append({
                 "step": len(steps) + 1,
                 "action": "Review validation rules",
@@ -619,27 +783,30 @@ class ExecutionGraph(BaseModel):
         Compute SHA256 hash of the graph for integrity verification.
         
         The hash covers all immutable content:
-        - execution_id, nodes, edges, stages
-        - Excludes: snapshot_at, integrity_hash (circular)
-        """
-        import hashlib
-        import json
+        - execution_id, root_node_id, total_latency_ms, node_count
+        - every node and edge, in order
+        - Excludes: created_at (build time), snapshot_at, integrity_hash (circular)
         
-        # Build canonical JSON representation
-        canonical = {
+        Node digests are memoized on the nodes and the result on the graph,
+        so repeated calls, snapshots and verdict copies only hash new content.
+        """
+        return self._content_hash
+    
+    @cached_property
+    def _content_hash(self) -> str:
+        """Hex digest behind compute_hash()."""
+        header = {
             "execution_id": self.execution_id,
-            "created_at": self.created_at,
-            "nodes": [n.model_dump() for n in self.nodes],
-            "edges": [e.model_dump() for e in self.edges],
             "root_node_id": self.root_node_id,
             "total_latency_ms": self.total_latency_ms,
             "node_count": self.node_count,
         }
-        
-        # Sort keys for deterministic output
-        content = json.dumps(canonical, sort_keys=True, default=str)
-        
-        return hashlib.sha256(content.encode()).hexdigest()
+        h = hashlib.sha256(json.dumps(header, sort_keys=True).encode())
+        for n in self.nodes:
+            h.update(n._digest)
+        for e in self.edges:
+            h.update(e.model_dump_json().encode())
+        return h.hexdigest()
     
     def to_snapshot(self) -> "ExecutionGraph":
         """
@@ -679,13 +846,35 @@ class ExecutionGraph(BaseModel):
         Returns:
             JSON string representation
         """
-        import json
+        # Serialize straight from the model, without an intermediate dict.
+        # Non-ASCII stays \u-escaped, as json.dumps wrote it, so exports
+        # of the same graph stay byte-stable.
+        return self.model_dump_json(indent=2 if pretty else None, ensure_ascii=True)
+    
+    def export_json_iter(self) -> Iterator[str]:
+        """
+        Export graph as compact JSON, yielded in chunks.
         
-        data = self.model_dump()
+        Same document as export_json(pretty=False), but nodes, edges and
+        stages are serialized one at a time, so large graphs can be
+        streamed to a file or socket without building the whole string.
         
-        if pretty:
-            return json.dumps(data, indent=2, default=str)
-        return json.dumps(data, default=str)
+        Returns:
+            Iterator of JSON text chunks
+        """
+        for i, name in enumerate(type(self).model_fields):
+            value = getattr(self, name)
+            yield ("{" if i == 0 else ",") + json.dumps(name) + ":"
+            if isinstance(value, list):
+                yield "["
+                for j, item in enumerate(value):
+                    yield ("," if j else "") + item.model_dump_json(ensure_ascii=True)
+                yield "]"
+            elif isinstance(value, BaseModel):
+                yield value.model_dump_json(ensure_ascii=True)
+            else:
+                yield json.dumps(value)
+        yield "}"
     
     def verify_integrity(self) -> bool:
         """
@@ -709,6 +898,16 @@ def _get_label(trace) -> str:
     return trace.request.model or "unknown"
 
 
+# Phase 19: Fixed node descriptions per role (LLM nodes name their model)
+_ROLE_DESCRIPTIONS = {
+    NodeRole.INPUT: "Handles incoming request",
+    NodeRole.TRANSFORM: "Transforms or parses data",
+    NodeRole.TOOL: "Executes tool or function",
+    NodeRole.VALIDATION: "Validates expectations",
+    NodeRole.OUTPUT: "Produces final output",
+}
+
+
 def _infer_semantics(trace, index: int, total: int) -> tuple:
     """
     Phase 19: Infer semantic role and generate human-readable labels.
@@ -750,15 +949,10 @@ def _infer_semantics(trace, index: int, total: int) -> tuple:
         human_label = f"{role.value.title()} ({model})"
     
     # Generate description
-    role_desc = {
-        NodeRole.INPUT: "Handles incoming request",
-        NodeRole.TRANSFORM: "Transforms or parses data",
-        NodeRole.LLM: f"LLM call to {model}",
-        NodeRole.TOOL: "Executes tool or function",
-        NodeRole.VALIDATION: "Validates expectations",
-        NodeRole.OUTPUT: "Produces final output",
-    }
-    description = role_desc.get(role, f"LLM call via {provider}")
+    if role == NodeRole.LLM:
+        description = f"LLM call to {model}"
+    else:
+        description = _ROLE_DESCRIPTIONS.get(role) or f"LLM call via {provider}"
     
     return role, human_label, description
 
@@ -774,13 +968,7 @@ def _generate_stages(nodes: list) -> list:
     - Output
     """
     import uuid
-    
-    if not nodes:
-        return []
-    
-    stages = []
-    current_group = None
-    current_nodes = []
+    from itertools import groupby
     
     # Stage name templates by role
     stage_names = {
@@ -792,40 +980,27 @@ def _generate_stages(nodes: list) -> list:
         NodeRole.OUTPUT: "Output Generation",
     }
     
-    for node in nodes:
-        role = node.role
-        
-        # Start new group if role changes
-        if current_group != role:
-            if current_nodes:
-                # Finalize previous stage
-                stage = GraphStage(
-                    stage_id=str(uuid.uuid4()),
-                    name=stage_names.get(current_group, "Processing"),
-                    description=f"{len(current_nodes)} node(s)",
-                    node_ids=[n.node_id for n in current_nodes],
-                    total_latency_ms=sum(n.latency_ms for n in current_nodes),
-                    node_count=len(current_nodes),
-                    has_failure=any(n.verdict_status == "fail" for n in current_nodes),
-                )
-                stages.append(stage)
-            
-            current_group = role
-            current_nodes = [node]
-        else:
-            current_nodes.append(node)
-    
-    # Finalize last stage
-    if current_nodes:
-        stage = GraphStage(
+    stages = []
+    
+    # A new stage starts whenever the role changes; each stage's ids,
+    # latency and failure flag are collected in one pass over its nodes
+    for role, group in groupby(nodes, key=lambda n: n.role):
+        node_ids = []
+        total_latency = 0
+        has_failure = False
+        for n in group:
+            node_ids.append(n.node_id)
+            total_latency += n.latency_ms
+            has_failure = has_failure or n.verdict_status == "fail"
+        
+        stages.append(GraphStage(
             stage_id=str(uuid.uuid4()),
-            name=stage_names.get(current_group, "Processing"),
-            description=f"{len(current_nodes)} node(s)",
-            node_ids=[n.node_id for n in current_nodes],
-            total_latency_ms=sum(n.latency_ms for n in current_nodes),
-            node_count=len(current_nodes),
-            has_failure=any(n.verdict_status == "fail" for n in current_nodes),
-        )
-        stages.append(stage)
+            name=stage_names.get(role, "Processing"),
+            description=f"{len(node_ids)} node(s)",
+            node_ids=node_ids,
+            total_latency_ms=total_latency,
+            node_count=len(node_ids),
+            has_failure=has_failure,
+        ))
     
     return stages
@@ -0,0 +1,59 @@
+"""
+Phylax Parallel Map
+
+Runs a (usually @trace'd) function over many inputs concurrently, so a
+loop of independent LLM calls overlaps its network waits.
+
+Design principles:
+- Output order matches input order
+- Concurrency is bounded by a semaphore
+- Each call sees the caller's execution context (same execution_id,
+  same parent node), exactly as it would in a plain for loop
+"""
+
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Iterable, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def parallel_map(
+    fn: Callable[[T], Union[R, Awaitable[R]]],
+    items: Iterable[T],
+    max_concurrency: int = 8,
+) -> list[R]:
+    """
+    Call fn on every item concurrently; returns the results in input order.
+
+    Usage:
+        with phylax.execution():
+            excursions = await phylax.parallel_map(get_excursions_in, cities)
+
+    Async functions are awaited on the running loop; sync functions run on
+    worker threads (asyncio.to_thread). If any call raises, the exception
+    propagates, as it would from the equivalent for loop.
+
+    Args:
+        fn: Function of one argument, sync or async
+        items: Inputs to call fn on
+        max_concurrency: Maximum number of calls in flight at once
+
+    Returns:
+        List of fn's results, one per item, in the order of items
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    sem = asyncio.Semaphore(max_concurrency)
+    is_async = inspect.iscoroutinefunction(fn)
+
+    async def run(item: T) -> Any:
+        # gather() runs each call in its own copy of the caller's context
+        async with sem:
+            if is_async:
+                return await fn(item)
+            return await asyncio.to_thread(fn, item)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
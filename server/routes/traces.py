@@ -4,7 +4,10 @@ Traces Routes
 Endpoints for trace CRUD operations.
 """
 
+import json
+
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from datetime import datetime
 
@@ -152,13 +155,15 @@ async def analyze_execution(execution_id: str) -> dict:
     if graph is None:
         raise HTTPException(status_code=404, detail=f"Execution {execution_id} not found")
     
+    analysis = graph.analyze(top_n=3)
+    
     return {
         "execution_id": execution_id,
         "node_count": graph.node_count,
         "total_latency_ms": graph.total_latency_ms,
-        "critical_path": graph.critical_path(),
-        "bottlenecks": graph.find_bottlenecks(top_n=3),
-        "verdict": graph.compute_verdict().model_dump(),
+        "critical_path": analysis["critical_path"],
+        "bottlenecks": analysis["bottlenecks"],
+        "verdict": analysis["verdict"].model_dump(),
     }
 
 
@@ -243,10 +248,12 @@ async def create_snapshot(execution_id: str) -> dict:
 
 
 @router.get("/executions/{execution_id}/export")
-async def export_graph(execution_id: str, format: str = "json") -> dict:
+async def export_graph(execution_id: str, format: str = "json") -> StreamingResponse:
     """
     Phase 25: Export graph as artifact for auditing.
     
+    The graph is streamed node by node rather than built as one body.
+    
     Args:
         format: Export format (json only for now)
         
@@ -260,13 +267,18 @@ async def export_graph(execution_id: str, format: str = "json") -> dict:
     
     snapshot = graph.to_snapshot()
     
-    return {
-        "execution_id": execution_id,
-        "format": format,
-        "integrity_hash": snapshot.integrity_hash,
-        "snapshot_at": snapshot.snapshot_at,
-        "data": snapshot.model_dump(),
-    }
+    def body():
+        header = json.dumps({
+            "execution_id": execution_id,
+            "format": format,
+            "integrity_hash": snapshot.integrity_hash,
+            "snapshot_at": snapshot.snapshot_at,
+        })
+        yield header[:-1] + ', "data": '
+        yield from snapshot.export_json_iter()
+        yield "}"
+    
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.get("/executions/{execution_id}/verify")
@@ -9,36 +9,60 @@ Default layout:
   traces/
     2026-01-16/
       trace_x.json
+      trace_y.json.gz   (when compression is enabled)
   config.yaml
 """
 
+import gzip
 import json
 import os
+from collections import deque
 from datetime import datetime
+from hashlib import sha256
 from pathlib import Path
 from typing import Optional
 
 from sdk.schema import Trace
 
 
+# Trace file suffixes, plain first: both are always readable
+TRACE_SUFFIXES = (".json", ".json.gz")
+
+
+def output_hash(text: str) -> str:
+    """
+    Hash a response text for golden-trace comparison.
+    
+    Used both when blessing a trace and when `phylax check` compares a
+    replay against it, so the two can never disagree on the algorithm.
+    """
+    # First 8 bytes as hex: same value as hexdigest()[:16], without
+    # formatting the 48 hex characters that get thrown away
+    return sha256(text.encode(), usedforsecurity=False).digest()[:8].hex()
+
+
 class FileStorage:
     """
     Filesystem-based trace storage.
     
-    Stores traces as JSON files organized by date.
+    Stores traces as JSON files organized by date. With `compress=True`
+    new traces are written gzip-compressed; plain and compressed files can
+    be mixed in one directory and are both read transparently.
     """
     
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, compress: bool = False):
         """
         Initialize file storage.
         
         Args:
             base_path: Base directory for traces. Defaults to ~/.Phylax
+            compress: Write new traces as .json.gz instead of .json
         """
         if base_path is None:
             base_path = os.path.expanduser("~/.Phylax")
         
         self.base_path = Path(base_path)
+        self.compress = compress
         self.traces_path = self.base_path / "traces"
         
         # Ensure directories exist
@@ -60,12 +84,39 @@ class FileStorage:
         date_dir.mkdir(exist_ok=True)
         
         # Save as JSON
-        trace_file = date_dir / f"{trace.trace_id}.json"
-        with open(trace_file, "w", encoding="utf-8") as f:
-            json.dump(trace.model_dump(), f, indent=2, ensure_ascii=False)
+        suffix = TRACE_SUFFIXES[1] if self.compress else TRACE_SUFFIXES[0]
+        trace_file = date_dir / f"{trace.trace_id}{suffix}"
+        self._write_trace_file(trace_file, trace)
         
         return str(trace_file)
     
+    def save_traces(self, traces: list[Trace]) -> list[str]:
+        """
+        Save several traces, creating each date directory once.
+        
+        Args:
+            traces: The traces to save
+            
+        Returns:
+            Paths to the saved trace files, in input order
+        """
+        suffix = TRACE_SUFFIXES[1] if self.compress else TRACE_SUFFIXES[0]
+        date_dirs: dict[str, Path] = {}
+        paths = []
+        
+        for trace in traces:
+            date_str = datetime.fromisoformat(trace.timestamp).strftime("%Y-%m-%d")
+            date_dir = date_dirs.get(date_str)
+            if date_dir is None:
+                date_dir = date_dirs[date_str] = self.traces_path / date_str
+                date_dir.mkdir(exist_ok=True)
+            
+            trace_file = date_dir / f"{trace.trace_id}{suffix}"
+            self._write_trace_file(trace_file, trace)
+            paths.append(str(trace_file))
+        
+        return paths
+    
     def get_trace(self, trace_id: str) -> Optional[Trace]:
         """
         Get a trace by ID.
@@ -76,17 +127,47 @@ class FileStorage:
         Returns:
             The trace, or None if not found
         """
-        # Search through date directories
+        trace_file = self._find_trace_file(trace_id)
+        if trace_file is None:
+            return None
+        
+        return self._load_trace(trace_file)
+    
+    def _find_trace_file(self, trace_id: str) -> Optional[Path]:
+        """Locate a trace's JSON file by searching the date directories."""
         for date_dir in self.traces_path.iterdir():
             if date_dir.is_dir():
-                trace_file = date_dir / f"{trace_id}.json"
-                if trace_file.exists():
-                    with open(trace_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    return Trace(**data)
+                for suffix in TRACE_SUFFIXES:
+                    trace_file = date_dir / f"{trace_id}{suffix}"
+                    if trace_file.exists():
+                        return trace_file
         
         return None
     
+    @staticmethod
+    def _load_trace(trace_file: Path) -> Trace:
+        """
+        Load a trace file straight into a Trace.
+        
+        Hands the raw bytes to pydantic's JSON parser, which validates while
+        parsing instead of building an intermediate dict first.
+        """
+        raw = trace_file.read_bytes()
+        if trace_file.name.endswith(".gz"):
+            raw = gzip.decompress(raw)
+        return Trace.model_validate_json(raw)
+    
+    @staticmethod
+    def _write_trace_file(trace_file: Path, trace: Trace) -> None:
+        """Write a trace file, compressing it if its name ends in .gz."""
+        if trace_file.name.endswith(".gz"):
+            # Level 1: most of the size win for a fraction of the CPU
+            with gzip.open(trace_file, "wt", encoding="utf-8", compresslevel=1) as f:
+                json.dump(trace.model_dump(), f, ensure_ascii=False)
+        else:
+            with open(trace_file, "w", encoding="utf-8") as f:
+                json.dump(trace.model_dump(), f, indent=2, ensure_ascii=False)
+    
     def list_traces(
         self,
         limit: int = 50,
@@ -94,16 +175,21 @@ class FileStorage:
         model: Optional[str] = None,
         provider: Optional[str] = None,
         date: Optional[str] = None,
+        verdict_status: Optional[str] = None,
     ) -> list[Trace]:
         """
         List traces with optional filtering.
         
+        Filters are applied before pagination, so `limit` counts matching
+        traces only.
+        
         Args:
             limit: Maximum number of traces to return
             offset: Number of traces to skip
             model: Filter by model name
             provider: Filter by provider
             date: Filter by date (YYYY-MM-DD format)
+            verdict_status: Filter by verdict status ("pass" or "fail")
             
         Returns:
             List of traces
@@ -120,17 +206,20 @@ class FileStorage:
             if not date_dir.is_dir():
                 continue
             
-            for trace_file in sorted(date_dir.glob("*.json"), reverse=True):
+            trace_files = [f for suffix in TRACE_SUFFIXES for f in date_dir.glob(f"*{suffix}")]
+            for trace_file in sorted(trace_files, reverse=True):
                 try:
-                    with open(trace_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    trace = Trace(**data)
+                    trace = self._load_trace(trace_file)
                     
                     # Apply filters
                     if model and trace.request.model != model:
                         continue
                     if provider and trace.request.provider != provider:
                         continue
+                    if verdict_status and (
+                        trace.verdict is None or trace.verdict.status != verdict_status
+                    ):
+                        continue
                     
                     traces.append(trace)
                 except Exception:
@@ -157,14 +246,12 @@ class FileStorage:
         Returns:
             True if deleted, False if not found
         """
-        for date_dir in self.traces_path.iterdir():
-            if date_dir.is_dir():
-                trace_file = date_dir / f"{trace_id}.json"
-                if trace_file.exists():
-                    trace_file.unlink()
-                    return True
+        trace_file = self._find_trace_file(trace_id)
+        if trace_file is None:
+            return False
         
-        return False
+        trace_file.unlink()
+        return True
     
     def get_lineage(self, trace_id: str) -> list[Trace]:
         """
@@ -190,19 +277,24 @@ class FileStorage:
             else:
                 break
         
+        # Index replays by the trace they replay: one listing for the
+        # whole walk instead of one per visited trace
+        replays: dict[str, list[Trace]] = {}
+        for t in self.list_traces(limit=1000):
+            if t.replay_of:
+                replays.setdefault(t.replay_of, []).append(t)
+        
         # Now traverse down from root
-        queue = [current]
+        queue = deque([current])
         while queue:
-            trace = queue.pop(0)
+            trace = queue.popleft()
             if trace.trace_id in visited:
                 continue
             visited.add(trace.trace_id)
             lineage.append(trace)
             
-            # Find children (traces that replay this trace)
-            for t in self.list_traces(limit=1000):
-                if t.replay_of == trace.trace_id:
-                    queue.append(t)
+            # Children are the traces that replay this trace
+            queue.extend(replays.get(trace.trace_id, ()))
         
         return lineage
     
@@ -216,16 +308,13 @@ class FileStorage:
         Returns:
             True if updated, False if not found
         """
-        # Find and update the trace
-        for date_dir in self.traces_path.iterdir():
-            if date_dir.is_dir():
-                trace_file = date_dir / f"{trace.trace_id}.json"
-                if trace_file.exists():
-                    with open(trace_file, "w", encoding="utf-8") as f:
-                        json.dump(trace.model_dump(), f, indent=2, ensure_ascii=False)
-                    return True
+        # Find and update the trace, keeping its existing format
+        trace_file = self._find_trace_file(trace.trace_id)
+        if trace_file is None:
+            return False
         
-        return False
+        self._write_trace_file(trace_file, trace)
+        return True
     
     def bless_trace(self, trace_id: str) -> Optional[Trace]:
         """
@@ -243,16 +332,12 @@ class FileStorage:
         
         # Create new trace with blessed=True
         # We need to recreate the trace since Pydantic models may not allow mutation
-        import hashlib
-        
-        # Calculate output hash for comparison
-        output_hash = hashlib.sha256(trace.response.text.encode()).hexdigest()[:16]
         
         # Update trace data
         trace_data = trace.model_dump()
         trace_data["blessed"] = True
         trace_data["metadata"] = trace_data.get("metadata") or {}
-        trace_data["metadata"]["output_hash"] = output_hash
+        trace_data["metadata"]["output_hash"] = output_hash(trace.response.text)
         trace_data["metadata"]["blessed_at"] = datetime.utcnow().isoformat()
         
         blessed_trace = Trace(**trace_data)
@@ -300,6 +385,38 @@ class FileStorage:
                 return trace
         return None
     
+    # =========================================================================
+    # Check cache
+    # =========================================================================
+    
+    def load_check_cache(self) -> dict:
+        """
+        Load the results of earlier passing `phylax check` replays.
+        
+        Returns:
+            Mapping of golden trace_id to its last passing replay; empty if
+            there is no cache or it cannot be read
+        """
+        cache_file = self.base_path / "check_cache.json"
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_check_cache(self, cache: dict) -> str:
+        """
+        Save the `phylax check` replay cache.
+        
+        Returns:
+            Path to the cache file
+        """
+        cache_file = self.base_path / "check_cache.json"
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+        
+        return str(cache_file)
+    
     # =========================================================================
     # Phase 14: Graph Storage
     # =========================================================================
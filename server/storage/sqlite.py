@@ -6,6 +6,7 @@ The JSON files remain the ground truth.
 """
 
 import sqlite3
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -183,11 +184,13 @@ class SQLiteIndex:
                     break
             
             # Now find all descendants
-            queue = [current_id]
+            queue = deque([current_id])
+            seen = set()
             while queue:
-                tid = queue.pop(0)
-                if tid in lineage:
+                tid = queue.popleft()
+                if tid in seen:
                     continue
+                seen.add(tid)
                 lineage.append(tid)
                 
                 cursor = conn.execute(
@@ -0,0 +1,114 @@
+"""
+Tests for the provider adapters
+"""
+
+import sys
+import types
+
+import pytest
+
+import sdk.adapters.gemini as gemini
+from sdk.adapters.gemini import GeminiAdapter, _to_gemini_contents
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    """Stand-in google.generativeai that records configure() calls."""
+    genai = types.SimpleNamespace(configured=[])
+    genai.configure = lambda api_key: genai.configured.append(api_key)
+    genai.GenerativeModel = lambda model: types.SimpleNamespace(model=model)
+    
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    monkeypatch.setattr(gemini, "_genai", None)
+    monkeypatch.setattr(gemini, "_configured_key", None)
+    return genai
+
+
+class TestGeminiClient:
+    """Tests for GeminiAdapter client setup."""
+    
+    def test_configures_once_per_key(self, fake_genai):
+        adapter = GeminiAdapter(api_key="k1", capture_layer=object())
+        adapter._get_client("m")
+        adapter._get_client("m")
+        GeminiAdapter(api_key="k1", capture_layer=object())._get_client("m")
+        GeminiAdapter(api_key="k2", capture_layer=object())._get_client("m")
+        assert fake_genai.configured == ["k1", "k2"]
+    
+    def test_model_cached_per_adapter(self, fake_genai):
+        adapter = GeminiAdapter(capture_layer=object())
+        assert adapter._get_client("a") is adapter._get_client("a")
+        assert adapter._get_client("b").model == "b"
+        assert fake_genai.configured == []
+    
+    def test_missing_package(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "google.generativeai", None)
+        monkeypatch.setattr(gemini, "_genai", None)
+        with pytest.raises(ImportError, match="pip install google-generativeai"):
+            GeminiAdapter(capture_layer=object())._get_client("m")
+
+
+class TestGeminiContents:
+    """Tests for converting chat messages to Gemini contents."""
+    
+    def test_roles(self):
+        contents = _to_gemini_contents([
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+            {"content": "no role"},
+        ])
+        assert contents == [
+            {"role": "user", "parts": ["hi"]},
+            {"role": "model", "parts": ["hello"]},
+            {"role": "user", "parts": ["no role"]},
+        ]
+    
+    def test_system_prepended_to_next_user_message(self):
+        contents = _to_gemini_contents([
+            {"role": "system", "content": "be brief"},
+            {"role": "user", "content": "hi"},
+            {"role": "system", "content": "trailing"},
+        ])
+        assert contents == [
+            {"role": "user", "parts": ["be brief", "hi"]},
+            {"role": "user", "parts": ["trailing"]},
+        ]
+
+
+class TestCallForwarding:
+    """Tests that adapters forward every parameter to the provider call."""
+    
+    def test_openai_chat(self):
+        from sdk.adapters.openai import OpenAIAdapter
+        from sdk.capture import CaptureLayer
+        
+        calls = []
+        adapter = OpenAIAdapter(api_key="k", capture_layer=CaptureLayer(auto_store=False))
+        adapter._client = types.SimpleNamespace(chat=types.SimpleNamespace(
+            completions=types.SimpleNamespace(create=lambda **kw: calls.append(kw) or {"text": "ok"}),
+        ))
+        
+        messages = [{"role": "user", "content": "hi"}]
+        response, trace = adapter.chat_completion("m", messages, max_tokens=5, top_p=0.5)
+        assert calls == [{
+            "model": "m", "messages": messages,
+            "temperature": 0.7, "max_tokens": 5, "top_p": 0.5,
+        }]
+        assert trace.response.text == "ok"
+    
+    def test_gemini_chat(self, fake_genai):
+        from sdk.capture import CaptureLayer
+        
+        calls = []
+        fake_genai.GenerativeModel = lambda model: types.SimpleNamespace(
+            generate_content=lambda contents, **kw: calls.append((model, contents, kw)) or "ok",
+        )
+        adapter = GeminiAdapter(capture_layer=CaptureLayer(auto_store=False))
+        
+        response, _ = adapter.generate("hi", model="g", max_tokens=9)
+        assert response == "ok"
+        assert calls == [("g", [{"role": "user", "parts": ["hi"]}],
+                          {"generation_config": {"temperature": 0.7, "max_output_tokens": 9}})]
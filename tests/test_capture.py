@@ -0,0 +1,348 @@
+"""
+Tests for the capture layer and @trace decorator
+"""
+
+import asyncio
+
+import pytest
+
+from sdk.capture import CaptureLayer
+from sdk.decorator import trace, expect
+from sdk.context import execution
+from server.storage.files import FileStorage
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestAsyncCapture:
+    """Tests for acapture() and acontext()."""
+    
+    def test_acapture_awaits_call_fn(self, tmp_path):
+        layer = CaptureLayer(storage_path=str(tmp_path))
+        
+        async def call(text):
+            await asyncio.sleep(0)
+            return {"text": text}
+        
+        response, t = asyncio.run(layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call, text="ok"))
+        assert response == {"text": "ok"}
+        assert t.response.text == "ok"
+        assert FileStorage(base_path=str(tmp_path)).get_trace(t.trace_id) is not None
+    
+    def test_acapture_accepts_sync_call_fn(self):
+        layer = CaptureLayer(auto_store=False)
+        _, t = asyncio.run(layer.acapture("openai", "gpt-4", MESSAGES, call_fn=lambda: "plain"))
+        assert t.response.text == "plain"
+        assert layer._pending_traces == [t]
+    
+    def test_acapture_overlaps_calls(self):
+        layer = CaptureLayer(auto_store=False)
+        
+        async def call():
+            await asyncio.sleep(0.05)
+            return "ok"
+        
+        async def run():
+            return await asyncio.gather(*(
+                layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call) for _ in range(5)
+            ))
+        
+        loop_time = asyncio.run(_timed(run()))
+        assert loop_time < 0.2
+        layer._pending_traces.clear()
+    
+    def test_acontext(self, tmp_path):
+        layer = CaptureLayer(storage_path=str(tmp_path))
+        
+        async def run():
+            async with layer.acontext("openai", "gpt-4") as ctx:
+                ctx.record(MESSAGES, {"text": "ok"})
+            return ctx.trace
+        
+        t = asyncio.run(run())
+        assert FileStorage(base_path=str(tmp_path)).get_trace(t.trace_id).response.text == "ok"
+
+
+class TestAsyncDecorator:
+    """Tests for @trace on coroutine functions."""
+    
+    def test_async_function_traced(self, tmp_path):
+        layer = CaptureLayer(storage_path=str(tmp_path))
+        
+        @trace(provider="openai", model="gpt-4", capture_layer=layer)
+        @expect(must_include=["ok"])
+        async def reply(messages):
+            await asyncio.sleep(0)
+            return {"text": "ok"}
+        
+        async def run():
+            with execution() as exec_id:
+                return exec_id, await reply(MESSAGES)
+        
+        exec_id, result = asyncio.run(run())
+        assert result == {"text": "ok"}
+        
+        traces = FileStorage(base_path=str(tmp_path)).list_traces()
+        assert len(traces) == 1
+        assert traces[0].execution_id == exec_id
+        assert traces[0].verdict.status == "pass"
+        assert traces[0].request.messages[0].content == "hi"
+
+
+async def _timed(coro):
+    """Await coro and return the elapsed loop time."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await coro
+    return loop.time() - start
+
+
+class TestFlush:
+    """Tests for flushing pending traces."""
+    
+    def test_trace_recorded_during_save_stays_pending(self, tmp_path, monkeypatch):
+        layer = CaptureLayer(storage_path=str(tmp_path), auto_store=False)
+        first = layer.capture("openai", "gpt-4", MESSAGES)[1]
+        storage = layer._get_storage()
+        save_traces = storage.save_traces
+        late = []
+        
+        def save_and_capture(traces):
+            late.append(layer.capture("openai", "gpt-4", MESSAGES)[1])
+            return save_traces(traces)
+        
+        monkeypatch.setattr(storage, "save_traces", save_and_capture)
+        assert layer.flush() == [first]
+        assert layer._pending_traces == late
+
+
+class TestBackgroundWriter:
+    """Tests for the background trace writer."""
+    
+    def test_flush_waits_for_writer(self, tmp_path):
+        layer = CaptureLayer(storage_path=str(tmp_path), background=True, flush_interval_ms=10)
+        traces = [layer.capture("openai", "gpt-4", MESSAGES)[1] for _ in range(40)]
+        layer.flush()
+        
+        storage = FileStorage(base_path=str(tmp_path))
+        assert all(storage.get_trace(t.trace_id) is not None for t in traces)
+    
+    def test_batches_capped(self, tmp_path, monkeypatch):
+        layer = CaptureLayer(storage_path=str(tmp_path), background=True, max_batch=4)
+        sizes = []
+        storage = layer._get_storage()
+        save_traces = storage.save_traces
+        monkeypatch.setattr(storage, "save_traces", lambda b: sizes.append(len(b)) or save_traces(b))
+        
+        for _ in range(10):
+            layer.capture("openai", "gpt-4", MESSAGES)
+        layer.flush()
+        
+        assert sum(sizes) == 10
+        assert max(sizes) <= 4
+
+    
+    def test_failing_storage_raises_to_caller(self, tmp_path, monkeypatch):
+        layer = CaptureLayer(storage_path=str(tmp_path), background=True, flush_interval_ms=10)
+        
+        def broken_storage():
+            raise OSError("storage unavailable")
+        
+        monkeypatch.setattr(layer, "_get_storage", broken_storage)
+        with pytest.raises(OSError):
+            layer.capture("openai", "gpt-4", MESSAGES)
+        assert layer._write_q is None
+        layer.flush()  # nothing queued, so nothing to wait for
+        
+        monkeypatch.undo()
+        t = layer.capture("openai", "gpt-4", MESSAGES)[1]
+        layer.flush()
+        assert FileStorage(base_path=str(tmp_path)).get_trace(t.trace_id) is not None
+
+
+class TestResponseCache:
+    """Tests for the exact-match response cache."""
+    
+    def test_identical_request_served_from_cache(self):
+        from sdk.cache import ResponseCache
+        
+        calls = []
+        layer = CaptureLayer(auto_store=False, cache=ResponseCache())
+        call = lambda: calls.append(1) or {"text": "ok"}
+        
+        first, t1 = layer.capture("openai", "gpt-4", MESSAGES, {"temperature": 0.1}, call_fn=call)
+        second, t2 = layer.capture("openai", "gpt-4", MESSAGES, {"temperature": 0.1}, call_fn=call)
+        layer.capture("openai", "gpt-4", MESSAGES, {"temperature": 0.9}, call_fn=call)
+        
+        assert len(calls) == 2
+        assert second is first
+        assert t1.metadata is None
+        assert t2.metadata == {"cache": "hit"}
+        assert t2.response.text == "ok" and t2.response.latency_ms == 0
+        assert (layer.cache.hits, layer.cache.misses) == (1, 2)
+    
+    def test_call_kwargs_are_keyed(self):
+        from sdk.cache import ResponseCache
+        
+        layer = CaptureLayer(auto_store=False, cache=ResponseCache())
+        call = lambda text: {"text": text}
+        
+        first, _ = layer.capture("openai", "gpt-4", MESSAGES, call_fn=call, text="A")
+        second, t = layer.capture("openai", "gpt-4", MESSAGES, call_fn=call, text="B")
+        
+        assert first == {"text": "A"}
+        assert second == {"text": "B"}
+        assert t.metadata is None
+    
+    def test_async_hit(self):
+        from sdk.cache import ResponseCache
+        
+        calls = []
+        layer = CaptureLayer(auto_store=False, cache=ResponseCache())
+        
+        async def call():
+            calls.append(1)
+            return "ok"
+        
+        async def run():
+            await layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call)
+            return await layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call)
+        
+        _, t = asyncio.run(run())
+        assert len(calls) == 1
+        assert t.metadata == {"cache": "hit"}
+    
+    def test_lru_eviction(self):
+        from sdk.cache import MISS, ResponseCache
+        
+        cache = ResponseCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is MISS
+        assert cache.get("a") == 1 and len(cache) == 2
+
+
+class TestCoalesce:
+    """Tests for coalescing identical in-flight async calls."""
+    
+    def test_concurrent_duplicates_call_once(self):
+        calls = []
+        layer = CaptureLayer(auto_store=False, coalesce=True)
+        
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"text": "ok"}
+        
+        async def run():
+            return await asyncio.gather(*(
+                layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call) for _ in range(10)
+            ))
+        
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(response is results[0][0] for response, _ in results)
+        assert [t.metadata for _, t in results].count({"cache": "coalesced"}) == 9
+        assert layer._inflight == {}
+    
+    def test_leader_error_reaches_followers(self):
+        layer = CaptureLayer(auto_store=False, coalesce=True)
+        
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+        
+        async def run():
+            return await asyncio.gather(
+                *(layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call) for _ in range(3)),
+                return_exceptions=True,
+            )
+        
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert layer._inflight == {}
+    
+    def test_off_by_default(self):
+        calls = []
+        layer = CaptureLayer(auto_store=False)
+        
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return "ok"
+        
+        async def run():
+            await asyncio.gather(*(
+                layer.acapture("openai", "gpt-4", MESSAGES, call_fn=call) for _ in range(3)
+            ))
+        
+        asyncio.run(run())
+        assert len(calls) == 3
+
+
+class TestBuildRequest:
+    """Tests for building the request from raw message dicts."""
+    
+    def test_messages_and_parameters_validated(self):
+        import pytest
+        from pydantic import ValidationError
+        from sdk.schema import TraceMessage
+        
+        layer = CaptureLayer(auto_store=False)
+        request = layer._build_request("openai", "gpt-4", MESSAGES, {"temperature": 0.5})
+        assert request.messages == [TraceMessage(role="user", content="hi")]
+        assert request.parameters.temperature == 0.5
+        
+        with pytest.raises(ValidationError):
+            layer._build_request("openai", "gpt-4", [{"content": "no role"}], None)
+
+
+class TestExtractResponse:
+    """Tests for pulling text and usage out of response shapes."""
+    
+    def test_response_shapes(self):
+        from types import SimpleNamespace as NS
+        
+        layer = CaptureLayer(auto_store=False)
+        chat = NS(
+            choices=[NS(message=NS(content="chat"))],
+            usage=NS(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+        )
+        assert layer._extract_response_text(chat) == "chat"
+        assert layer._extract_response_text(NS(choices=[NS(text="completion")])) == "completion"
+        assert layer._extract_response_text(NS(choices=[])) == "namespace(choices=[])"
+        assert layer._extract_response_text({"text": "dict"}) == "dict"
+        assert layer._extract_response_text({"other": 1}) == "{'other': 1}"
+        assert layer._extract_usage(chat) == {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3}
+        assert layer._extract_usage("plain") is None
+
+
+class TestRuntimeDetection:
+    """Tests for the cached library/version lookups."""
+    
+    def test_library_version_cached(self):
+        import openai
+        from sdk.capture import _detect_library, _get_library_version
+        
+        assert _detect_library("OpenAI") == "openai"
+        assert _get_library_version("openai") == openai.__version__
+        hits = _get_library_version.cache_info().hits
+        _get_library_version("openai")
+        assert _get_library_version.cache_info().hits == hits + 1
+    
+    @pytest.mark.slow
+    def test_version_without_import(self):
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys\n"
+            "from sdk.capture import _get_library_version\n"
+            "assert _get_library_version('openai') != 'unknown'\n"
+            "assert 'openai' not in sys.modules\n"
+            "assert _get_library_version('someprovider') == 'unknown'\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,166 @@
+"""
+Tests for the CLI argument parser
+"""
+
+import pytest
+
+from cli.main import _build_parser, _PARSER_BUILDERS
+
+
+class TestParser:
+    """Tests for lazy subparser construction."""
+
+    def test_single_command_parser(self):
+        parser = _build_parser("show")
+        args = parser.parse_args(["show", "abc", "--json"])
+        assert args.command == "show"
+        assert args.trace_id == "abc"
+        assert args.json is True
+
+    def test_full_parser_lists_all_commands(self):
+        help_text = _build_parser().format_help()
+        for name in _PARSER_BUILDERS:
+            assert name in help_text
+
+    def test_subcommand_help_matches_full_parser(self, capsys):
+        for name in _PARSER_BUILDERS:
+            with pytest.raises(SystemExit):
+                _build_parser(name).parse_args([name, "-h"])
+            lazy = capsys.readouterr().out
+            with pytest.raises(SystemExit):
+                _build_parser().parse_args([name, "-h"])
+            full = capsys.readouterr().out
+            assert lazy == full
+
+    def test_unknown_command_errors(self):
+        with pytest.raises(SystemExit):
+            _build_parser("bogus").parse_args(["bogus"])
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """FileStorage rooted in a temporary HOME, seeded with a pass and a fail."""
+    from sdk.schema import Trace, TraceRequest, TraceResponse, TraceRuntime, TraceMessage, Verdict
+    from server.storage.files import FileStorage
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    store = FileStorage()
+    for trace_id, status in [("t-pass", "pass"), ("t-fail", "fail")]:
+        store.save_trace(Trace(
+            trace_id=trace_id,
+            request=TraceRequest(
+                provider="openai",
+                model="gpt-4",
+                messages=[TraceMessage(role="user", content="hello")],
+            ),
+            response=TraceResponse(text="world", latency_ms=12),
+            runtime=TraceRuntime(library="openai", version="1.0"),
+            verdict=Verdict(
+                status=status,
+                violations=[] if status == "pass" else ["missing 'refund'"],
+            ),
+        ))
+    return store
+
+
+class TestOutput:
+    """Tests for list/show output."""
+
+    def test_list_output(self, storage, capsys):
+        from cli.main import main
+
+        assert main(["list"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("STATUS")
+        assert len(lines) == 5  # header, rule, two traces, one violation
+        assert lines[-1].strip() == "└─ missing 'refund'"
+
+    def test_show_output(self, storage, capsys):
+        from cli.main import main
+
+        assert main(["show", "t-fail"]) == 0
+        out = capsys.readouterr().out
+        assert "❌ VERDICT: FAIL" in out
+        assert "  [user]: hello\n" in out
+        assert out.endswith("  world\n")
+
+
+class TestReplayArgs:
+    """Tests for rebuilding adapter arguments from a trace."""
+
+    def test_matches_model_dump(self, storage):
+        from cli.main import _replay_args
+
+        trace = storage.get_trace("t-pass")
+        messages, params = _replay_args(trace)
+        assert messages == [{"role": "user", "content": "hello"}]
+        assert params == trace.request.parameters.model_dump(exclude_none=True)
+
+
+class TestListFilters:
+    """Tests for pushing list filters into storage."""
+
+    def test_failed_filter_applies_before_limit(self, storage, capsys):
+        from cli.main import main
+
+        # t-pass sorts first; a post-filter would see only it and report nothing
+        assert main(["list", "--failed", "-n", "1"]) == 0
+        out = capsys.readouterr().out
+        assert "t-fail" in out
+        assert "t-pass" not in out
+
+
+class TestCheckAdapters:
+    """Tests for sharing adapters across check workers."""
+
+    def test_one_adapter_per_used_provider(self, storage):
+        from cli.main import _check_adapters
+        from sdk.adapters.openai import OpenAIAdapter
+
+        adapters = _check_adapters(storage.list_traces())
+        assert list(adapters) == ["openai"]
+        assert isinstance(adapters["openai"], OpenAIAdapter)
+
+
+class TestParserCache:
+    """Tests for in-process parser reuse."""
+
+    def test_parser_is_reused(self):
+        assert _build_parser("list") is _build_parser("list")
+        assert _build_parser("bogus") is _build_parser()
+
+
+class TestCheckCache:
+    """Tests for reusing earlier passing replays in `phylax check --cached`."""
+
+    def test_cached_pass_requires_unchanged_golden(self, storage):
+        from cli.main import _cached_check, _golden_hash
+
+        trace = storage.get_trace("t-pass")
+        entry = {"model": "gpt-4", "original_hash": _golden_hash(trace), "new_hash": "x"}
+        assert _cached_check(trace, {"t-pass": entry})["cached"] is True
+        assert _cached_check(trace, {"t-pass": {**entry, "original_hash": "stale"}}) is None
+        assert _cached_check(trace, {}) is None
+
+    def test_cache_round_trip(self, storage):
+        assert storage.load_check_cache() == {}
+        storage.save_check_cache({"t-pass": {"new_hash": "x"}})
+        assert storage.load_check_cache() == {"t-pass": {"new_hash": "x"}}
+
+    def test_error_drops_cached_pass(self, storage, monkeypatch, capsys):
+        import cli.main
+        from cli.main import _golden_hash, main
+
+        class FailingAdapter:
+            def chat_completion(self, **kwargs):
+                raise RuntimeError("provider down")
+
+        trace = storage.bless_trace("t-pass")
+        storage.save_check_cache({"t-pass": {"model": "gpt-4", "original_hash": _golden_hash(trace)}})
+        monkeypatch.setattr(cli.main, "_check_adapters", lambda traces: {"openai": FailingAdapter()})
+
+        assert main(["check"]) == 1
+        assert storage.load_check_cache() == {}
+        # The errored replay must not be reported as a cached pass
+        assert main(["check", "--cached"]) == 1
+        assert "PASS (cached)" not in capsys.readouterr().out
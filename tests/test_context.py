@@ -72,6 +72,23 @@ class TestExecutionContext:
             pop_node()
             assert get_parent_node_id() is None
     
+    def test_pop_with_token(self):
+        """pop_node(token) should restore the stack push_node() replaced."""
+        with execution():
+            push_node("node_1")
+            token = push_node("node_2")
+            pop_node(token)
+            assert get_parent_node_id() == "node_1"
+    
+    def test_copied_contexts_do_not_share_stack(self):
+        """A push in a copied context should not leak into the original."""
+        import contextvars
+        
+        with execution():
+            push_node("node_1")
+            contextvars.copy_context().run(push_node, "node_2")
+            assert get_parent_node_id() == "node_1"
+    
     def test_nested_execution_contexts(self):
         """Nested execution() calls should be independent."""
         with execution() as outer_id:
@@ -8,6 +8,7 @@ import pytest
 
 from sdk.expectations import (
     evaluate,
+    build_evaluator,
     Verdict,
     Evaluator,
     MustIncludeRule,
@@ -104,6 +105,13 @@ class TestMinTokensRule:
         assert result.passed is False
         assert "expected at least 10" in result.violation_message
     
+    def test_exact_boundary_and_count(self):
+        assert MinTokensRule(3).evaluate("  one two\nthree ", 100).passed is True
+        result = MinTokensRule(4).evaluate("  one two\nthree ", 100)
+        assert result.passed is False
+        assert "~3 tokens" in result.violation_message
+        assert MinTokensRule(0).evaluate("", 100).passed is True
+    
     def test_severity_is_low(self):
         rule = MinTokensRule(5)
         assert rule.severity == "low"
@@ -155,6 +163,14 @@ class TestEvaluator:
         verdict = evaluator.evaluate("None of those letters.", 100)
         assert verdict.status == "fail"
         assert len(verdict.violations) == 3
+    
+    def test_mixed_case_sensitivity(self):
+        evaluator = Evaluator()
+        evaluator.must_include(["REFUND"])
+        evaluator.must_not_include(["Sorry"], case_sensitive=True)
+        evaluator.must_not_include(["SORRY"])
+        verdict = evaluator.evaluate("sorry, your refund failed", 100)
+        assert verdict.violations == ["forbidden substring(s) found: ['SORRY']"]
 
 
 class TestEvaluateFunction:
@@ -187,6 +203,45 @@ class TestEvaluateFunction:
         assert verdict.severity == "medium"
 
 
+class TestBuildEvaluator:
+    """Tests for reusing a prebuilt evaluator (as @expect does)."""
+    
+    def test_matches_evaluate(self):
+        expectations = {
+            "must_include": ["refund"],
+            "must_not_include": ["sorry"],
+            "max_latency_ms": 1000,
+            "min_tokens": 3,
+        }
+        evaluator = build_evaluator(**expectations)
+        for text, latency in [("Your refund is approved.", 500), ("sorry", 3000)]:
+            assert evaluator.evaluate(text, latency) == evaluate(text, latency, **expectations)
+    
+    def test_expect_builds_evaluator_once(self):
+        from sdk.decorator import expect, _function_expectations
+        
+        @expect(must_include=["refund"], max_latency_ms=1500)
+        def reply():
+            ...
+        
+        evaluator = _function_expectations[reply]["_evaluator"]
+        assert [r.name for r in evaluator.rules] == ["must_include", "max_latency_ms"]
+    
+    def test_expectations_do_not_pin_function(self):
+        import gc
+        from sdk.decorator import expect, _function_expectations
+        
+        @expect(must_include=["refund"])
+        def reply():
+            ...
+        
+        assert reply.__phylax_expect__ is _function_expectations[reply]
+        count = len(_function_expectations)
+        del reply
+        gc.collect()
+        assert len(_function_expectations) == count - 1
+
+
 class TestVerdictImmutability:
     """Test that Verdict is immutable."""
     
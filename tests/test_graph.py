@@ -0,0 +1,331 @@
+"""
+Tests for the Execution Graph
+"""
+
+import json
+import uuid
+
+import pytest
+
+from sdk.schema import Trace, TraceRequest, TraceResponse, TraceMessage, TraceRuntime, Verdict
+from sdk.graph import ExecutionGraph
+
+
+def make_trace(execution_id, node_id, parent_node_id=None, latency_ms=100, verdict_status="pass"):
+    """Build a minimal trace as one graph node."""
+    return Trace(
+        execution_id=execution_id,
+        node_id=node_id,
+        parent_node_id=parent_node_id,
+        request=TraceRequest(
+            provider="test",
+            model="test-model",
+            messages=[TraceMessage(role="user", content=f"Node {node_id}")],
+        ),
+        response=TraceResponse(text=f"Response for {node_id}", latency_ms=latency_ms),
+        runtime=TraceRuntime(library="test", version="1.0.0"),
+        verdict=Verdict(
+            status=verdict_status,
+            violations=[] if verdict_status == "pass" else ["test violation"],
+        ),
+    )
+
+
+@pytest.fixture
+def graph():
+    """
+    root -> a (fail) -> c
+         -> b
+    """
+    exec_id = str(uuid.uuid4())
+    return ExecutionGraph.from_traces([
+        make_trace(exec_id, "root", None, 100),
+        make_trace(exec_id, "a", "root", 300, "fail"),
+        make_trace(exec_id, "b", "root", 50),
+        make_trace(exec_id, "c", "a", 200),
+    ])
+
+
+class TestTraversal:
+    """Tests for graph traversal helpers."""
+    
+    def test_children_and_parent(self, graph):
+        assert graph.get_children("root") == ["a", "b"]
+        assert graph.get_children("c") == []
+        assert graph.get_parent("c") == "a"
+        assert graph.get_parent("root") is None
+    
+    def test_get_node(self, graph):
+        assert graph.get_node("b").latency_ms == 50
+        assert graph.get_node("missing") is None
+    
+    def test_topological_order(self, graph):
+        assert graph.topological_order() == ["root", "a", "b", "c"]
+    
+    def test_returned_lists_do_not_alias_cache(self, graph):
+        graph.get_children("root").append("x")
+        graph.topological_order().clear()
+        assert graph.get_children("root") == ["a", "b"]
+        assert len(graph.topological_order()) == 4
+    
+    def test_tainted_nodes(self, graph):
+        assert set(graph.get_tainted_nodes("a")) == {"a", "c"}
+    
+    def test_model_copy_rebuilds_indexes(self, graph):
+        graph.topological_order()  # warm the caches
+        single = graph.model_copy(update={"nodes": graph.nodes[:1], "edges": []})
+        assert single.get_children("root") == []
+        assert single.get_node("a") is None
+        assert single.topological_order() == ["root"]
+
+
+class TestAnalysis:
+    """Tests for verdict and performance analysis."""
+    
+    def test_verdict(self, graph):
+        verdict = graph.compute_verdict()
+        assert verdict.status == "fail"
+        assert verdict.root_cause_node == "a"
+        assert verdict.tainted_count == 1
+    
+    def test_critical_path(self, graph):
+        cp = graph.critical_path()
+        assert cp["path"] == ["root", "a", "c"]
+        assert cp["total_latency_ms"] == 600
+        assert cp["bottleneck_node"] == "a"
+    
+    def test_results_cached_without_aliasing(self, graph):
+        assert graph.compute_verdict() is graph.compute_verdict()
+        graph.critical_path()["path"].append("x")
+        assert graph.critical_path()["path"] == ["root", "a", "c"]
+    
+    def test_verdict_copy_recomputes_verdict(self, graph):
+        assert graph.compute_verdict().status == "fail"
+        fixed = graph.with_node_verdict("a", "pass")
+        assert fixed.compute_verdict().status == "pass"
+        assert fixed.critical_path() == graph.critical_path()
+    
+    def test_cached_indexes_not_serialized(self, graph):
+        before = graph.model_dump()
+        graph.critical_path()
+        assert graph.model_dump() == before
+        assert ExecutionGraph(**before) == graph
+    
+    def test_critical_path_diamond(self):
+        exec_id = str(uuid.uuid4())
+        graph = ExecutionGraph.from_traces([
+            make_trace(exec_id, "s", None, 10),
+            make_trace(exec_id, "fast", "s", 5),
+            make_trace(exec_id, "slow", "s", 50),
+            make_trace(exec_id, "end", "slow", 1),
+        ])
+        assert graph.critical_path()["path"] == ["s", "slow", "end"]
+    
+    def test_find_bottlenecks(self, graph):
+        top = graph.find_bottlenecks(top_n=2)
+        assert [b["node_id"] for b in top] == ["a", "c"]
+        assert top[0]["percent_of_total"] == 46.2
+
+
+class TestWithNodeVerdict:
+    """Tests for deriving a graph with one verdict changed."""
+    
+    def test_flip_to_pass(self, graph):
+        graph.critical_path()  # warm the caches
+        fixed = graph.with_node_verdict("a", "pass")
+        
+        assert fixed.compute_verdict().status == "pass"
+        assert fixed.get_node("a").verdict_status == "pass"
+        assert not any(st.has_failure for st in fixed.stages)
+        assert graph.get_node("a").verdict_status == "fail"
+        assert fixed.topological_order() == graph.topological_order()
+        assert fixed._children is graph._children  # edges unchanged: index shared
+    
+    def test_flip_to_fail(self, graph):
+        broken = graph.with_node_verdict("b", "fail")
+        assert broken.compute_verdict().failed_count == 2
+    
+    def test_unknown_node(self, graph):
+        with pytest.raises(ValueError):
+            graph.with_node_verdict("missing", "fail")
+
+
+class TestBlastRadius:
+    """Tests for tainted-node propagation."""
+    
+    def test_overlapping_failures_counted_once(self):
+        exec_id = str(uuid.uuid4())
+        graph = ExecutionGraph.from_traces([
+            make_trace(exec_id, "r", None, 10, "fail"),
+            make_trace(exec_id, "x", "r", 10, "fail"),
+            make_trace(exec_id, "y", "x", 10),
+            make_trace(exec_id, "z", "y", 10),
+        ])
+        verdict = graph.compute_verdict()
+        assert verdict.root_cause_node == "r"
+        assert verdict.failed_count == 2
+        assert verdict.tainted_count == 2
+        assert set(graph.get_tainted_nodes("x")) == {"x", "y", "z"}
+
+
+class TestAnalyze:
+    """Tests for analyze()."""
+    
+    def test_matches_separate_calls(self, graph):
+        analysis = graph.analyze(top_n=2)
+        assert analysis["verdict"] == graph.compute_verdict()
+        assert analysis["critical_path"] == graph.critical_path()
+        assert analysis["bottlenecks"] == graph.find_bottlenecks(top_n=2)
+    
+    def test_uses_cached_results(self, graph):
+        assert graph.analyze()["verdict"] is graph.compute_verdict()
+        graph.analyze()["critical_path"]["path"].append("x")
+        assert graph.critical_path()["path"] == ["root", "a", "c"]
+    
+    def test_model_copy_recomputes(self, graph):
+        graph.analyze()  # warm the caches
+        passing = graph.get_node("root")
+        single = graph.model_copy(update={"nodes": [passing], "edges": []})
+        analysis = single.analyze()
+        assert analysis["verdict"].status == "pass"
+        assert analysis["critical_path"]["path"] == ["root"]
+
+
+class TestComputeHash:
+    """Tests for the memoized integrity hash and JSON export."""
+    
+    def test_snapshot_verifies(self, graph):
+        snapshot = graph.to_snapshot()
+        assert snapshot.integrity_hash == graph.compute_hash()
+        assert snapshot.verify_integrity()
+    
+    def test_ignores_build_time(self, graph):
+        rebuilt = graph.model_copy(update={"created_at": "2000-01-01T00:00:00"})
+        assert rebuilt.compute_hash() == graph.compute_hash()
+    
+    def test_verdict_copy_rehashes(self, graph):
+        before = graph.compute_hash()
+        flipped = graph.with_node_verdict("a", "pass")
+        assert flipped.compute_hash() != before
+        assert flipped.with_node_verdict("a", "fail").compute_hash() == before
+    
+    def test_model_copy_rehashes(self, graph):
+        snapshot = graph.to_snapshot()
+        assert snapshot.verify_integrity()
+        node = snapshot.nodes[0]
+        node._digest  # warm the node cache too
+        tampered = snapshot.model_copy(update={
+            "nodes": [node.model_copy(update={"latency_ms": 1})] + snapshot.nodes[1:],
+        })
+        assert tampered.compute_hash() != snapshot.compute_hash()
+        assert not tampered.verify_integrity()
+    
+    def test_unchanged_nodes_keep_digest(self, graph):
+        graph.compute_hash()
+        flipped = graph.with_node_verdict("a", "pass")
+        assert flipped.get_node("b") is graph.get_node("b")
+        assert "_digest" in flipped.get_node("b").__dict__
+        assert "_digest" not in flipped.get_node("a").__dict__
+    
+    def test_export_json_round_trips(self, graph):
+        snapshot = graph.to_snapshot()
+        for pretty in (True, False):
+            data = json.loads(snapshot.export_json(pretty=pretty))
+            assert data == snapshot.model_dump(mode="json")
+        restored = ExecutionGraph.model_validate_json(snapshot.export_json())
+        assert restored.verify_integrity()
+    
+    def test_pretty_export_escapes_like_json_dumps(self, graph):
+        named = graph.model_copy(update={"execution_id": "exécution ☃"})
+        expected = json.dumps(named.model_dump(), indent=2, default=str)
+        assert named.export_json() == expected
+        assert named.export_json().isascii()
+    
+    def test_export_json_iter_matches_export(self, graph):
+        snapshot = graph.to_snapshot()
+        chunks = list(snapshot.export_json_iter())
+        assert len(chunks) > graph.node_count
+        assert "".join(chunks) == snapshot.export_json(pretty=False)
+
+
+class TestDiff:
+    """Tests for diff_with."""
+    
+    def test_changes_in_node_order(self):
+        old = ExecutionGraph.from_traces([
+            make_trace("e1", f"n{i}", "n0" if i else None, 100) for i in range(6)
+        ])
+        new = ExecutionGraph.from_traces([
+            make_trace("e2", f"n{i}", "n0" if i else None, 100 if i % 2 else 400)
+            for i in range(2, 9)
+        ])
+        diff = old.diff_with(new)
+        assert [d.node_label for d in diff.added_nodes] == ["Node n6", "Node n7", "Node n8"]
+        assert [d.node_label for d in diff.removed_nodes] == ["Node n0", "Node n1"]
+        assert [d.node_label for d in diff.changed_nodes] == ["Node n2", "Node n4"]
+        assert diff.changed_nodes[0].latency_delta_ms == 300
+        assert diff.total_changes == 7
+    
+    def test_verdict_copy(self, graph):
+        diff = graph.diff_with(graph.with_node_verdict("a", "pass"))
+        assert [d.node_label for d in diff.changed_nodes] == ["Node a"]
+        assert diff.changed_nodes[0].new_verdict == "pass"
+        assert diff.verdict_changed
+        assert not graph.diff_with(graph.with_node_verdict("c", "fail")).verdict_changed
+
+
+class TestStages:
+    """Tests for auto-generated stages."""
+    
+    def test_stages_partition_nodes(self, graph):
+        assert [i for st in graph.stages for i in st.node_ids] == [n.node_id for n in graph.nodes]
+        for st in graph.stages:
+            nodes = [graph.get_node(i) for i in st.node_ids]
+            assert len({n.role for n in nodes}) == 1
+            assert st.node_count == len(nodes)
+            assert st.total_latency_ms == sum(n.latency_ms for n in nodes)
+            assert st.has_failure == any(n.verdict_status == "fail" for n in nodes)
+
+
+class TestInvestigationPath:
+    """Tests for the cached investigation path."""
+    
+    def test_steps(self, graph):
+        steps = graph.investigation_path()
+        assert steps[0]["node_id"] == "a"
+        assert steps[1]["node_id"] == "root"
+        assert sorted(steps[-1]["node_ids"]) == ["a", "c"]
+    
+    def test_returned_steps_do_not_alias_cache(self, graph):
+        graph.investigation_path()[-1]["node_ids"].append("x")
+        assert sorted(graph.investigation_path()[-1]["node_ids"]) == ["a", "c"]
+    
+    def test_verdict_copy_recomputes(self, graph):
+        graph.investigation_path()
+        steps = graph.with_node_verdict("a", "pass").investigation_path()
+        assert steps[0]["action"] == "No failures detected"
+
+
+class TestPackageExports:
+    """Tests for the lazily loaded graph exports of the sdk package."""
+    
+    @pytest.mark.slow
+    def test_graph_loaded_on_first_access(self):
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys, sdk\n"
+            "assert 'sdk.graph' not in sys.modules\n"
+            "from sdk import ExecutionGraph, NodeRole\n"
+            "import sdk.graph\n"
+            "assert ExecutionGraph is sdk.graph.ExecutionGraph\n"
+            "assert 'NodeDiff' in dir(sdk)\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+    
+    def test_unknown_attribute(self):
+        import sdk
+        
+        with pytest.raises(AttributeError):
+            sdk.NotAThing
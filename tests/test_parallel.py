@@ -0,0 +1,103 @@
+"""
+Tests for parallel_map
+
+Tests for:
+- result order and concurrency bound
+- sync and async functions
+- execution context and parent node propagation
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from sdk.capture import CaptureLayer
+from sdk.context import execution, push_node, pop_node
+from sdk.decorator import trace
+from sdk.parallel import parallel_map
+
+
+class TestParallelMap:
+    """Tests for ordering and concurrency."""
+    
+    def test_preserves_order(self):
+        async def slow_square(x):
+            await asyncio.sleep(0.001 * (5 - x))
+            return x * x
+        
+        assert asyncio.run(parallel_map(slow_square, range(5))) == [0, 1, 4, 9, 16]
+    
+    def test_bounds_concurrency(self):
+        running = 0
+        peak = 0
+        
+        async def work(x):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            return x
+        
+        asyncio.run(parallel_map(work, range(10), max_concurrency=3))
+        assert peak == 3
+    
+    def test_sync_function_runs_on_threads(self):
+        threads = set()
+        
+        def work(x):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return x + 1
+        
+        assert asyncio.run(parallel_map(work, [1, 2, 3])) == [2, 3, 4]
+        assert threading.get_ident() not in threads
+    
+    def test_exception_propagates(self):
+        async def work(x):
+            if x == 2:
+                raise RuntimeError("boom")
+            return x
+        
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(parallel_map(work, range(4)))
+    
+    def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError):
+            asyncio.run(parallel_map(str, [1], max_concurrency=0))
+
+
+class TestContextPropagation:
+    """Traced calls keep the caller's execution and parent node."""
+    
+    @pytest.mark.parametrize("is_async", [True, False])
+    def test_traces_share_execution_and_parent(self, tmp_path, is_async):
+        layer = CaptureLayer(storage_path=str(tmp_path))
+        traces = []
+        original = layer._store_trace
+        layer._store_trace = lambda t: (traces.append(t), original(t))
+        
+        if is_async:
+            @trace(provider="test", capture_layer=layer)
+            async def step(x):
+                await asyncio.sleep(0.001)
+                return f"result {x}"
+        else:
+            @trace(provider="test", capture_layer=layer)
+            def step(x):
+                return f"result {x}"
+        
+        async def run():
+            with execution() as exec_id:
+                push_node("parent")
+                results = await parallel_map(step, range(6), max_concurrency=3)
+                pop_node()
+            return exec_id, results
+        
+        exec_id, results = asyncio.run(run())
+        assert results == [f"result {i}" for i in range(6)]
+        assert len(traces) == 6
+        assert {t.execution_id for t in traces} == {exec_id}
+        assert {t.parent_node_id for t in traces} == {"parent"}
@@ -0,0 +1,149 @@
+"""
+Tests for File Storage
+"""
+
+from pathlib import Path
+
+from sdk.schema import (
+    Trace,
+    TraceRequest,
+    TraceResponse,
+    TraceRuntime,
+    TraceMessage,
+)
+from server.storage.files import FileStorage
+
+
+def make_trace(trace_id: str, text: str = "world") -> Trace:
+    """Build a minimal trace for storage tests."""
+    return Trace(
+        trace_id=trace_id,
+        request=TraceRequest(
+            provider="openai",
+            model="gpt-4",
+            messages=[TraceMessage(role="user", content="hello")],
+        ),
+        response=TraceResponse(text=text, latency_ms=10),
+        runtime=TraceRuntime(library="openai", version="1.0"),
+    )
+
+
+class TestCompression:
+    """Tests for gzip-compressed trace files."""
+    
+    def test_compressed_round_trip(self, tmp_path):
+        storage = FileStorage(base_path=str(tmp_path), compress=True)
+        path = storage.save_trace(make_trace("gz", text="resp " * 1000))
+        
+        assert path.endswith(".json.gz")
+        assert storage.get_trace("gz").response.text == "resp " * 1000
+    
+    def test_mixed_formats_are_listed(self, tmp_path):
+        FileStorage(base_path=str(tmp_path)).save_trace(make_trace("plain"))
+        storage = FileStorage(base_path=str(tmp_path), compress=True)
+        storage.save_trace(make_trace("gz"))
+        
+        ids = {t.trace_id for t in storage.list_traces()}
+        assert ids == {"plain", "gz"}
+    
+    def test_update_keeps_format(self, tmp_path):
+        storage = FileStorage(base_path=str(tmp_path), compress=True)
+        storage.save_trace(make_trace("gz"))
+        
+        blessed = storage.bless_trace("gz")
+        assert blessed.blessed
+        assert storage.get_trace("gz").blessed
+        assert storage._find_trace_file("gz").name == "gz.json.gz"
+        
+        assert storage.delete_trace("gz")
+        assert storage.get_trace("gz") is None
+
+
+class TestOutputHash:
+    """Tests for the golden output hash."""
+    
+    def test_matches_truncated_hexdigest(self):
+        import hashlib
+        from server.storage.files import output_hash
+        
+        text = "Hello! How can I help?"
+        assert output_hash(text) == hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class TestBatchSave:
+    """Tests for saving several traces at once."""
+    
+    def test_save_traces(self, tmp_path):
+        storage = FileStorage(base_path=str(tmp_path))
+        paths = storage.save_traces([make_trace("a"), make_trace("b", text="two")])
+        
+        assert [Path(p).name for p in paths] == ["a.json", "b.json"]
+        assert storage.get_trace("b").response.text == "two"
+    
+    def test_capture_batch(self, tmp_path):
+        from sdk.capture import CaptureLayer
+        
+        layer = CaptureLayer(storage_path=str(tmp_path))
+        messages = [{"role": "user", "content": "hi"}]
+        with layer.batch():
+            _, first = layer.capture("openai", "gpt-4", messages)
+            _, second = layer.capture("openai", "gpt-4", messages)
+            assert layer._get_storage().get_trace(first.trace_id) is None
+        
+        assert layer.auto_store
+        storage = FileStorage(base_path=str(tmp_path))
+        assert storage.get_trace(first.trace_id) is not None
+        assert storage.get_trace(second.trace_id) is not None
+    
+    def test_capture_batch_is_per_context(self, tmp_path):
+        import threading
+        from sdk.capture import CaptureLayer
+        from sdk.decorator import trace
+        
+        layer = CaptureLayer(storage_path=str(tmp_path))
+        messages = [{"role": "user", "content": "hi"}]
+        
+        @trace(provider="openai", model="gpt-4", capture_layer=layer)
+        def traced():
+            return {"text": "ok"}
+        
+        other = []
+        with layer.batch():
+            traced()
+            worker = threading.Thread(target=lambda: other.append(layer.capture("openai", "gpt-4", messages)[1]))
+            worker.start()
+            worker.join()
+            # The other thread's trace is stored at once; the @trace call is held
+            assert layer._get_storage().get_trace(other[0].trace_id) is not None
+            assert layer._get_storage().list_traces() == [other[0]]
+        
+        assert len(FileStorage(base_path=str(tmp_path)).list_traces()) == 2
+    
+    def test_capture_batch_per_layer(self, tmp_path):
+        from sdk.capture import CaptureLayer
+        
+        outer = CaptureLayer(storage_path=str(tmp_path / "outer"))
+        inner = CaptureLayer(storage_path=str(tmp_path / "inner"))
+        messages = [{"role": "user", "content": "hi"}]
+        with outer.batch():
+            with inner.batch():
+                _, held = outer.capture("openai", "gpt-4", messages)
+                inner.capture("openai", "gpt-4", messages)
+            # inner's batch is saved on its exit; outer's trace is still held
+            assert len(inner._get_storage().list_traces()) == 1
+            assert outer._get_storage().get_trace(held.trace_id) is None
+        
+        assert outer._get_storage().get_trace(held.trace_id) is not None
+
+
+class TestLineage:
+    """Tests for walking replay lineage."""
+    
+    def test_lineage_from_root(self, tmp_path):
+        storage = FileStorage(base_path=str(tmp_path))
+        root = make_trace("r")
+        replay = make_trace("a").model_copy(update={"replay_of": "r"})
+        replay_of_replay = make_trace("b").model_copy(update={"replay_of": "a"})
+        storage.save_traces([root, replay, replay_of_replay, make_trace("other")])
+        
+        assert [t.trace_id for t in storage.get_lineage("r")] == ["r", "a", "b"]